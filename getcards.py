@@ -9,10 +9,31 @@ Fetch all Clash Royale cards using CR_API_KEY from .env and store the results in
 import os
 import json
 import pathlib
-import requests
 
 from dotenv import load_dotenv
 
+from src.api import _cache
+from src.api._http import get_session
+
+try:
+    import orjson  # optional: much faster (de)serialization for the card dumps
+except ImportError:
+    orjson = None
+
+
+def _write_json(path: pathlib.Path, obj, pretty: bool) -> None:
+    """Write obj as UTF-8 JSON; indent only when the file is meant to be hand-edited."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        path.write_bytes(orjson.dumps(obj, option=option))
+        return
+
+    with path.open("w", encoding="utf-8") as f:
+        if pretty:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+
 
 # -----------------------------------------
 # Load environment variables
@@ -44,12 +65,14 @@ def main():
         "Authorization": f"Bearer {api_key}",
     }
 
-    print("➡️ Fetching cards from Clash Royale API...")
-    resp = requests.get("https://api.clashroyale.com/v1/cards", headers=headers, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    def _fetch_cards():
+        print("➡️ Fetching cards from Clash Royale API...")
+        resp = get_session().get("https://api.clashroyale.com/v1/cards", headers=headers, timeout=30)
+        resp.raise_for_status()
+        return resp.json().get("items", [])
 
-    items = data.get("items", [])
+    # The card catalog only changes on game patches, so a 24h cache is safe
+    items = _cache.get_or_fetch("cards", "cards", _cache.CARDS_TTL, _fetch_cards)
     print(f"✅ Received {len(items)} cards.")
 
     # -----------------------------------------
@@ -63,10 +86,9 @@ def main():
     meta_path = data_dir / "card_metadata.json"
 
     # -----------------------------------------
-    # Save raw API response
+    # Save raw API response (machine-read only, so compact)
     # -----------------------------------------
-    with raw_path.open("w", encoding="utf-8") as f:
-        json.dump(items, f, ensure_ascii=False, indent=2)
+    _write_json(raw_path, items, pretty=False)
 
     # -----------------------------------------
     # Build editable metadata template
@@ -85,8 +107,7 @@ def main():
             "is_bridge_spam_piece": False,
         })
 
-    with meta_path.open("w", encoding="utf-8") as f:
-        json.dump(meta_items, f, ensure_ascii=False, indent=2)
+    _write_json(meta_path, meta_items, pretty=True)
 
     print(f"💾 Saved raw cards to:        {raw_path}")
     print(f"💾 Saved card metadata to:    {meta_path}")
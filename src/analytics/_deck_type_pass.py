@@ -0,0 +1,191 @@
+# src/analytics/_deck_type_pass.py
+"""
+Single classification pass over normalized battles.
+
+Classifies each battle's two decks once and feeds every deck-type
+aggregation from it: the standardized participant table (meta_standardize)
+and the deck-type stats / matchups (user_analytics). Kept here rather than in
+either consumer so the meta modules don't depend on user analytics.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ._encode import (
+    FLIPPED_RESULT,
+    FLIPPED_RESULT_CODES,
+    encode_keys,
+    encode_results,
+    group_counts,
+)
+from .deck_type import classify_deck_cached
+
+
+def _classify(cards: Any) -> Tuple[Optional[str], Optional[Exception]]:
+    """(deck type, None), or (None, error) if classification fails."""
+    try:
+        return classify_deck_cached(cards), None
+    except Exception as e:
+        return None, e
+
+
+def _type_rows_from_counts(types: List[str], counts: Any) -> List[Dict[str, Any]]:
+    """[games, wins, losses, draws] rows -> deck-type dicts, sorted like summarize_deck_types."""
+    out: List[Dict[str, Any]] = []
+    for deck_type, (games, wins, losses, draws) in zip(types, counts.tolist()):
+        out.append(
+            {
+                "type": deck_type,
+                "games": games,
+                "wins": wins,
+                "losses": losses,
+                "draws": draws,
+                "win_rate": wins / games if games > 0 else 0.0,
+            }
+        )
+
+    # Sort by win_rate desc, then by games desc (more games = more reliable)
+    out.sort(key=lambda x: (x["win_rate"], x["games"]), reverse=True)
+    return out
+
+
+def build_all_meta_outputs(
+    battles_normalized: List[Dict[str, Any]],
+    *,
+    min_matchup_games: int = 1,
+    include_meta_table: bool = True,
+) -> Dict[str, Any]:
+    """
+    One pass over the battles that classifies each deck once and feeds every
+    deck-type aggregation at the same time.
+
+    Shared by user_analytics (deck-type stats + matchups) and
+    meta_standardize (participant table).
+
+    Returns:
+        {
+          "meta_table": [...],          # == build_standardized_meta_table(...)
+          "deck_type_matchups": [...],  # == compute_deck_type_matchups(...)
+          "my_deck_types": [...],       # == summarize_deck_types(...)[0]
+          "opp_deck_types": [...],      # == summarize_deck_types(...)[1]
+        }
+
+    Each output keeps its own filtering rules:
+      - meta_table: both card fields must be lists, result must be win/loss/draw
+      - deck-type stats / matchups: only full 8-card decks are counted
+
+    Raises:
+        The classification error for a battle that belongs in meta_table
+        (include_meta_table=True), so the table never silently loses battles.
+        For the deck-type stats, decks that fail to classify are skipped.
+    """
+    meta_table: List[Dict[str, Any]] = []
+    pairs: List[Tuple[str, str]] = []
+    pair_results: List[Any] = []
+    my_types: List[str] = []
+    my_results: List[Any] = []
+    opp_types: List[str] = []
+    opp_results: List[Any] = []
+
+    for idx, battle in enumerate(battles_normalized):
+        result = battle.get("result")
+        my_cards = battle.get("my_cards")
+        opp_cards = battle.get("opp_cards")
+
+        my_type, my_err = _classify(my_cards) if my_cards is not None else (None, None)
+        opp_type, opp_err = (
+            _classify(opp_cards) if opp_cards is not None else (None, None)
+        )
+
+        # --- Standardized participant table (one row per side) ---
+        if (
+            include_meta_table
+            and isinstance(my_cards, list)
+            and isinstance(opp_cards, list)
+            and result in FLIPPED_RESULT
+        ):
+            if my_err is not None or opp_err is not None:
+                raise my_err or opp_err
+
+            # Try to keep a stable id if one exists, otherwise use index
+            battle_id = battle.get("battle_id", idx)
+            opp_result = FLIPPED_RESULT[result]
+            meta_table.append(
+                {
+                    "battle_id": battle_id,
+                    "battle_index": idx,
+                    "deck_type": my_type,
+                    "role": "my",
+                    "result": result,
+                    "is_win": result == "win",
+                }
+            )
+            meta_table.append(
+                {
+                    "battle_id": battle_id,
+                    "battle_index": idx,
+                    "deck_type": opp_type,
+                    "role": "opp",
+                    "result": opp_result,
+                    "is_win": opp_result == "win",
+                }
+            )
+
+        # --- Deck-type stats: only trust full 8-card decks ---
+        my_full = my_type if my_cards and len(my_cards) == 8 else None
+        opp_full = opp_type if opp_cards and len(opp_cards) == 8 else None
+
+        if my_full is not None:
+            my_types.append(my_full)
+            my_results.append(result)
+        if opp_full is not None:
+            opp_types.append(opp_full)
+            opp_results.append(result)
+        if my_full is not None and opp_full is not None:
+            pairs.append((my_full, opp_full))
+            pair_results.append(result)
+
+    # Aggregate counts over int-encoded arrays
+    pair_keys, pair_ids = encode_keys(pairs)
+    pair_counts = group_counts(pair_ids, encode_results(pair_results), len(pair_keys))
+
+    deck_type_matchups: List[Dict[str, Any]] = []
+    for (my_type, opp_type), (games, wins, losses, draws) in zip(
+        pair_keys, pair_counts.tolist()
+    ):
+        if games < min_matchup_games:
+            continue
+
+        deck_type_matchups.append(
+            {
+                "my_deck_type": my_type,
+                "opp_deck_type": opp_type,
+                "games": games,
+                "wins": wins,
+                "losses": losses,
+                "draws": draws,
+                "win_rate": wins / games if games > 0 else 0.0,
+            }
+        )
+
+    # Sort: more games first, then higher winrate
+    deck_type_matchups.sort(key=lambda d: (d["games"], d["win_rate"]), reverse=True)
+
+    my_keys, my_ids = encode_keys(my_types)
+    opp_keys, opp_ids = encode_keys(opp_types)
+
+    return {
+        "meta_table": meta_table,
+        "deck_type_matchups": deck_type_matchups,
+        "my_deck_types": _type_rows_from_counts(
+            my_keys, group_counts(my_ids, encode_results(my_results), len(my_keys))
+        ),
+        # Opponent stats are from the opponent's POV (result flipped)
+        "opp_deck_types": _type_rows_from_counts(
+            opp_keys,
+            group_counts(
+                opp_ids,
+                encode_results(opp_results, FLIPPED_RESULT_CODES),
+                len(opp_keys),
+            ),
+        ),
+    }
@@ -0,0 +1,141 @@
+#src/analytics/_encode.py
+"""
+Integer encoding + counting kernels for the analytics aggregations.
+
+Cards / deck-type pairs are mapped to dense int32 ids (first-seen order) and
+results to small codes, so per-group [games, wins, losses, draws] counts are a
+single tight loop over int arrays instead of dict updates per row.
+
+The loop is JIT-compiled with numba when it is installed; otherwise an
+equivalent np.bincount implementation is used.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit  # optional: JIT for the counting loop
+except ImportError:
+    njit = None
+
+# Flip a result when we swap POV (my side <-> opponent side)
+FLIPPED_RESULT: Dict[str, str] = {"win": "loss", "loss": "win", "draw": "draw"}
+
+# result -> code, from the POV of the side being counted; anything else is a draw
+RESULT_CODES: Dict[str, int] = {"win": 0, "loss": 1}
+FLIPPED_RESULT_CODES: Dict[str, int] = {
+    res: RESULT_CODES[flipped]
+    for res, flipped in FLIPPED_RESULT.items()
+    if flipped in RESULT_CODES
+}
+DRAW_CODE = 2
+
+
+def encode_results(results: Iterable[Any], codes: Dict[str, int] = RESULT_CODES) -> np.ndarray:
+    """Map results to int8 codes (0=win, 1=loss, 2=draw/other)."""
+    return np.fromiter((codes.get(r, DRAW_CODE) for r in results), dtype=np.int8)
+
+
+# Per-battle result column: like RESULT_CODES, but keeps missing/unknown
+# results apart from real draws so summaries can count them separately.
+UNKNOWN_CODE = -1
+_RESULT_COLUMN_CODES: Dict[str, int] = {"win": 0, "loss": 1, "draw": DRAW_CODE}
+
+# result column code -> counting code; index -1 (unknown) hits the last slot
+_COUNTING_CODES = np.array([0, 1, DRAW_CODE, DRAW_CODE], dtype=np.int8)
+_FLIPPED_COUNTING_CODES = np.array([1, 0, DRAW_CODE, DRAW_CODE], dtype=np.int8)
+
+
+def encode_result_column(results: Iterable[Any]) -> np.ndarray:
+    """Map results to int8 codes (0=win, 1=loss, 2=draw, -1=anything else)."""
+    return np.fromiter(
+        (_RESULT_COLUMN_CODES.get(r, UNKNOWN_CODE) for r in results), dtype=np.int8
+    )
+
+
+def counting_codes(result_column: np.ndarray, flipped: bool = False) -> np.ndarray:
+    """
+    Result column codes -> group_counts codes (unknown counts as a draw).
+
+    flipped=True gives the other side's POV (win <-> loss).
+    """
+    table = _FLIPPED_COUNTING_CODES if flipped else _COUNTING_CODES
+    return table[result_column]
+
+
+def encode_keys(keys: Iterable[Hashable]) -> Tuple[List[Hashable], np.ndarray]:
+    """
+    Assign dense int32 ids to keys in first-seen order.
+
+    Returns (id -> key list, per-item id array).
+    """
+    ids: Dict[Hashable, int] = {}
+    encoded = np.fromiter(
+        (ids.setdefault(k, len(ids)) for k in keys), dtype=np.int32
+    )
+    return list(ids), encoded
+
+
+def encode_card_lists(
+    card_lists: Sequence[Sequence[str]],
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Flatten per-battle card lists into (card names, flat card ids, lengths).
+
+    lengths[i] is the number of cards in battle i, so per-battle values can be
+    expanded to per-card with np.repeat(values, lengths).
+    """
+    lengths = np.fromiter((len(cards) for cards in card_lists), dtype=np.int64)
+    names, card_ids = encode_keys(c for cards in card_lists for c in cards)
+    return names, card_ids, lengths
+
+
+def _group_counts_numpy(group_ids: np.ndarray, result_codes: np.ndarray, n_groups: int) -> np.ndarray:
+    out = np.zeros((n_groups, 4), dtype=np.int64)
+    out[:, 0] = np.bincount(group_ids, minlength=n_groups)
+    for code in (0, 1, DRAW_CODE):
+        out[:, 1 + code] = np.bincount(group_ids[result_codes == code], minlength=n_groups)
+    return out
+
+
+def _group_counts_loop(group_ids, result_codes, n_groups):
+    out = np.zeros((n_groups, 4), dtype=np.int64)
+    for i in range(group_ids.shape[0]):
+        g = group_ids[i]
+        out[g, 0] += 1
+        out[g, 1 + result_codes[i]] += 1
+    return out
+
+
+_group_counts = njit(cache=True)(_group_counts_loop) if njit is not None else _group_counts_numpy
+
+
+def group_counts(group_ids: np.ndarray, result_codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Count [games, wins, losses, draws] per group id.
+
+    Returns an int64 array of shape (n_groups, 4).
+    """
+    if n_groups == 0:
+        return np.zeros((0, 4), dtype=np.int64)
+    return _group_counts(group_ids, result_codes, n_groups)
+
+
+def key_result_counts(
+    keys: Iterable[Hashable],
+    results: Iterable[Any],
+) -> Tuple[List[Hashable], np.ndarray]:
+    """
+    Count [games, wins, losses, draws] per key over parallel key/result columns.
+
+    Every row counts as a game; only win/loss/draw rows fill a result slot
+    (unknown results are games without a result). Keys are in first-seen order.
+    """
+    names, key_ids = encode_keys(keys)
+    result_codes = encode_result_column(results)
+
+    known = result_codes != UNKNOWN_CODE
+    counts = group_counts(key_ids[known], result_codes[known], len(names))
+    counts[:, 0] = np.bincount(key_ids, minlength=len(names))
+    return names, counts
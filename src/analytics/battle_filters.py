@@ -1,5 +1,6 @@
 #src/analytics/battle_filters.py
-from typing import Any, Dict, List
+from sys import intern
+from typing import Any, Dict, Iterable, List, Optional
 
 RANKED_MODE_ID_WHITELIST = {
     72000006,  # Ladder (Trophy Road)
@@ -73,20 +74,23 @@ def normalize_battle(battle: Dict[str, Any]) -> Dict[str, Any]:
 
     result = _compute_result(my_crowns, opp_crowns)
 
+    # Card / mode names repeat across every battle: intern them so all
+    # normalized battles share one string object per name (the JSON parser
+    # creates a fresh copy per occurrence).
     my_cards = [
-        c.get("name", "").strip()
+        intern(c.get("name", "").strip())
         for c in my_side.get("cards", [])
         if isinstance(c, dict) and c.get("name")
     ]
 
     opp_cards = [
-        c.get("name", "").strip()
+        intern(c.get("name", "").strip())
         for c in opp_side.get("cards", [])
         if isinstance(c, dict) and c.get("name")
     ]
 
     game_mode = battle.get("gameMode", {}) or {}
-    mode_name = game_mode.get("name") or (battle.get("type") or "")
+    mode_name = intern(game_mode.get("name") or (battle.get("type") or ""))
 
     return {
         "battle_time": battle.get("battleTime"),
@@ -98,19 +102,25 @@ def normalize_battle(battle: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def filter_and_normalize_ranked_1v1(
-    battles_raw: List[Dict[str, Any]],
+    battles_raw: Iterable[Dict[str, Any]],
+    limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     Filter raw battlelog entries down to ranked/Trophy Road 1v1 battles
     and normalize them to a clean structure.
 
     Args:
-        battles_raw: List of raw battle dicts from the API.
+        battles_raw: Raw battle dicts from the API (list or any iterable,
+            e.g. the iter_player_battlelog generator).
+        limit: Stop after this many ranked battles (API order is most recent
+            first); the remaining entries are not normalized.
 
     Returns:
         List of normalized battle dicts.
     """
     normalized: List[Dict[str, Any]] = []
+    if limit is not None and limit <= 0:
+        return normalized
 
     for battle in battles_raw:
         if not isinstance(battle, dict):
@@ -120,5 +130,7 @@ def filter_and_normalize_ranked_1v1(
             continue
 
         normalized.append(normalize_battle(battle))
+        if limit is not None and len(normalized) >= limit:
+            break
 
     return normalized
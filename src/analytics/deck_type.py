@@ -1,7 +1,15 @@
 #/src/analytics/deck_type.py
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple, Union
+
+from ._encode import FLIPPED_RESULT
+
+try:
+    import orjson  # optional: faster load of card_metadata.json
+except ImportError:
+    orjson = None
 
 # ---------- Load card metadata ----------
 
@@ -9,8 +17,11 @@ BASE_DIR = Path(__file__).resolve().parents[1]  # .../src
 DATA_DIR = BASE_DIR / "data"
 CARD_METADATA_PATH = DATA_DIR / "card_metadata.json"
 
-with CARD_METADATA_PATH.open("r", encoding="utf-8") as f:
-    _CARD_META_LIST: List[Dict[str, Any]] = json.load(f)
+if orjson is not None:
+    _CARD_META_LIST: List[Dict[str, Any]] = orjson.loads(CARD_METADATA_PATH.read_bytes())
+else:
+    with CARD_METADATA_PATH.open("r", encoding="utf-8") as f:
+        _CARD_META_LIST = json.load(f)
 
 # Map by card name for quick lookup
 _CARD_META_BY_NAME: Dict[str, Dict[str, Any]] = {c["name"]: c for c in _CARD_META_LIST}
@@ -30,6 +41,16 @@ ARCHETYPE_BRIDGE_SPAM = "Bridge Spam"
 ARCHETYPE_BEATDOWN = "Beatdown"
 ARCHETYPE_HYBRID = "Hybrid"
 
+# Every archetype classify_deck can return, in display (alphabetical) order
+ALL_ARCHETYPES: Tuple[str, ...] = (
+    ARCHETYPE_BAIT,
+    ARCHETYPE_BEATDOWN,
+    ARCHETYPE_BRIDGE_SPAM,
+    ARCHETYPE_CYCLE,
+    ARCHETYPE_HYBRID,
+    ARCHETYPE_SIEGE,
+)
+
 # For Siege rules
 _SIEGE_XBOW = {"X-Bow"}
 _SIEGE_MORTAR = {"Mortar"}
@@ -151,6 +172,39 @@ def classify_deck(cards: List[str]) -> str:
     # =========================================
     return ARCHETYPE_HYBRID
 
+
+
+# Order-free deck identity: a frozenset for normal decks, sorted tuple otherwise
+DeckKey = Union[FrozenSet[str], Tuple[str, ...]]
+
+
+def deck_key(cards: Iterable[str]) -> DeckKey:
+    """
+    Order-free, hashable, exact key for a deck.
+
+    Real decks have 8 distinct cards, so a frozenset (hashing only, no string
+    sort) identifies them exactly. If a list ever repeats a card we fall back
+    to a sorted tuple so duplicates still count.
+    Use sorted(key) to get the card list back in a stable order.
+    """
+    cards = list(cards)
+    key = frozenset(cards)
+    if len(key) == len(cards):
+        return key
+    return tuple(sorted(cards))
+
+
+@lru_cache(maxsize=8192)
+def classify_deck_key(key: DeckKey) -> str:
+    """classify_deck memoized on a deck_key(); shared by every analytics pass."""
+    # classify_deck is order-insensitive, so any iteration order is fine
+    return classify_deck(list(key))
+
+
+def classify_deck_cached(cards: Iterable[str]) -> str:
+    """Memoized classify_deck for a plain card list."""
+    return classify_deck_key(deck_key(cards))
+
 # -----------------------------------------
 # Aggregation helpers: deck-type stats
 # -----------------------------------------
@@ -189,6 +243,9 @@ def _deck_type_stats_to_list(
     out.sort(key=lambda x: (x["win_rate"], x["games"]), reverse=True)
     return out
 
+# result -> stats field; anything else counts as a draw
+_RESULT_FIELD: Dict[str, str] = {"win": "wins", "loss": "losses"}
+
 def summarize_deck_types(
     battles_normalized: List[Dict[str, Any]]
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
@@ -231,7 +288,7 @@ def summarize_deck_types(
         # Expect 8 cards; if not, just skip this battle for deck-type stats
         try:
             if len(my_cards) == 8:
-                my_type = classify_deck(my_cards)
+                my_type = classify_deck_cached(my_cards)
             else:
                 # skip weird decks instead of raising
                 my_type = None
@@ -240,7 +297,7 @@ def summarize_deck_types(
 
         try:
             if len(opp_cards) == 8:
-                opp_type = classify_deck(opp_cards)
+                opp_type = classify_deck_cached(opp_cards)
             else:
                 opp_type = None
         except Exception:
@@ -250,23 +307,13 @@ def summarize_deck_types(
         if my_type is not None:
             bucket = _ensure_bucket(my_stats, my_type)
             bucket["games"] += 1
-            if result == "win":
-                bucket["wins"] += 1
-            elif result == "loss":
-                bucket["losses"] += 1
-            else:
-                bucket["draws"] += 1
+            bucket[_RESULT_FIELD.get(result, "draws")] += 1
 
         # Update "opponent" deck-type stats (flip win/loss perspective)
         if opp_type is not None:
             bucket = _ensure_bucket(opp_stats, opp_type)
             bucket["games"] += 1
-            if result == "win":
-                bucket["losses"] += 1  
-            elif result == "loss":
-                bucket["wins"] += 1     
-            else:
-                bucket["draws"] += 1
+            bucket[_RESULT_FIELD.get(FLIPPED_RESULT.get(result), "draws")] += 1
 
     my_deck_types = _deck_type_stats_to_list(my_stats)
     opp_deck_types = _deck_type_stats_to_list(opp_stats)
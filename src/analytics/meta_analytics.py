@@ -1,102 +1,80 @@
 #src/analytics/meta_analytics.py
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import pandas as pd
+import numpy as np
 
 from . import deck_type as deck_type_mod
 
-# Sync with archetypes in deck_type.py
-DECK_TYPES: List[str] = ["Bait", "Beatdown", "Bridge Spam", "Cycle", "Hybrid", "Siege"]
+# Single source of truth: the archetypes defined in deck_type.py
+DECK_TYPES: Tuple[str, ...] = deck_type_mod.ALL_ARCHETYPES
 
 
-def _classify_deck(cards: List[str]) -> str:
-    """
-    Small wrapper so we don't depend on an exact function name in deck_type.py.
-
-    Prefers:
-        - classify_deck_from_cards(cards)
-    Fallback:
-        - classify_deck(cards)
-    Final fallback:
-        - "Hybrid"
-    """
-    if hasattr(deck_type_mod, "classify_deck_from_cards"):
-        return deck_type_mod.classify_deck_from_cards(cards)  # type: ignore[attr-defined]
-    if hasattr(deck_type_mod, "classify_deck"):
-        return deck_type_mod.classify_deck(cards)  # type: ignore[attr-defined]
-    return "Hybrid"
-
+# Integer codes for the (my_idx, opp_idx, result_idx) count cube.
+_TYPE_IDX: Dict[str, int] = {t: i for i, t in enumerate(DECK_TYPES)}
+_RESULTS: Tuple[str, ...] = ("win", "loss", "draw")
+_RESULT_IDX: Dict[str, int] = {r: i for i, r in enumerate(_RESULTS)}
+_OTHER_RESULT_IDX = len(_RESULTS)  # anything else: counted as a game only
 
-def _flip_result(res: str) -> str:
-    """Flip a result when we swap POV: win<->loss, draw stays draw."""
-    if res == "win":
-        return "loss"
-    if res == "loss":
-        return "win"
-    return "draw"
+# Flip a result code when we swap POV: win<->loss, draw/other stay put.
+_FLIPPED_RESULT_IDX = np.array([1, 0, 2, 3], dtype=np.int8)
 
 
-def _build_symmetric_matchup_matrix(df: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, Any]]]:
+def _build_symmetric_matchup_matrix(
+    rows: Iterable[Tuple[str, str, str]],
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """
     Build a deck-type vs deck-type matchup table that counts BOTH sides.
 
-    For each game we create two rows:
+    `rows` are (my_deck_type, opp_deck_type, result) tuples. For each game we
+    count two entries:
       1) my_deck_type  vs opp_deck_type, result = result
       2) opp_deck_type vs my_deck_type, result = flipped(result)
 
     So 'Bait' stats include all games where Bait showed up, regardless of side.
+
+    Counts live in an int32 cube of shape (n_types, n_types, 4) indexed by
+    [deck_idx, opp_idx, result_idx], filled with two np.add.at calls.
     """
-    if df.empty:
+    rows = list(rows)
+    if not rows:
         return {}
 
-    rows: List[Dict[str, Any]] = []
-
-    for _, row in df.iterrows():
-        my_type = row["my_deck_type"]
-        opp_type = row["opp_deck_type"]
-        res = row["result"]
-
-        # POV: my deck (ranker)
-        rows.append(
-            {"deck_type": my_type, "opp_type": opp_type, "result": res}
-        )
+    # DECK_TYPES first (fixed order); anything unexpected gets appended
+    type_idx = dict(_TYPE_IDX)
+    for my_type, opp_type, _ in rows:
+        type_idx.setdefault(my_type, len(type_idx))
+        type_idx.setdefault(opp_type, len(type_idx))
+    types = list(type_idx)
 
-        # POV: opponent deck
-        rows.append(
-            {
-                "deck_type": opp_type,
-                "opp_type": my_type,
-                "result": _flip_result(res),
-            }
-        )
+    my_i = np.fromiter((type_idx[r[0]] for r in rows), dtype=np.intp, count=len(rows))
+    opp_i = np.fromiter((type_idx[r[1]] for r in rows), dtype=np.intp, count=len(rows))
+    res_i = np.fromiter(
+        (_RESULT_IDX.get(r[2], _OTHER_RESULT_IDX) for r in rows),
+        dtype=np.int8,
+        count=len(rows),
+    )
 
-    tmp = pd.DataFrame(rows)
+    counts = np.zeros((len(types), len(types), _OTHER_RESULT_IDX + 1), dtype=np.int32)
+    np.add.at(counts, (my_i, opp_i, res_i), 1)
+    np.add.at(counts, (opp_i, my_i, _FLIPPED_RESULT_IDX[res_i]), 1)
 
-    group = tmp.groupby(["deck_type", "opp_type"])["result"]
-    agg = group.agg(
-        games="count",
-        wins=lambda s: (s == "win").sum(),
-        losses=lambda s: (s == "loss").sum(),
-        draws=lambda s: (s == "draw").sum(),
-    ).reset_index()
-
-    # Avoid division by zero
-    agg["win_rate"] = agg["wins"] / agg["games"].where(agg["games"] > 0, 1)
+    games = counts.sum(axis=-1)
 
     matrix: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
-    for _, row in agg.iterrows():
-        deck_type: str = row["deck_type"]
-        opp_type: str = row["opp_type"]
-
-        matrix.setdefault(deck_type, {})[opp_type] = {
-            "games": int(row["games"]),
-            "wins": int(row["wins"]),
-            "losses": int(row["losses"]),
-            "draws": int(row["draws"]),
-            "win_rate": float(row["win_rate"]),
+    # Only emit cells that actually had games
+    for i, j in zip(*np.nonzero(games)):
+        wins, losses, draws = counts[i, j, :3].tolist()
+        n = int(games[i, j])
+        matrix.setdefault(types[i], {})[types[j]] = {
+            "games": n,
+            "wins": wins,
+            "losses": losses,
+            "draws": draws,
+            "win_rate": wins / n,
         }
 
     return matrix
@@ -143,7 +121,76 @@ def compute_meta_analytics(normalized_battles: List[Dict[str, Any]]) -> Dict[str
       - deck_type_counts_opp
     Those keys are preserved; only deck_type_matchups logic is new.
     """
-    if not normalized_battles:
+    return meta_analytics_from_counts(accumulate_meta_counts(normalized_battles))
+
+
+def accumulate_meta_counts(
+    normalized_battles: List[Dict[str, Any]],
+    counts: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Classify battles and add them to running meta counts.
+
+    `counts` is a previous return value (or None to start fresh); it is not
+    modified. Lets callers that keep appending battles (the Phase 0 loop) only
+    classify the new ones.
+
+    Returns:
+        {
+          "results": Counter of result values,
+          "my": Counter of my deck types,
+          "opp": Counter of opp deck types,
+          "rows": [(my_deck_type, opp_deck_type, result), ...],
+        }
+    """
+    if counts is None:
+        counts = {"results": Counter(), "my": Counter(), "opp": Counter(), "rows": []}
+
+    # Single pass: summary counts + deck-type classification for BOTH sides.
+    # Plain Python is cheaper than building a full DataFrame for ~hundreds of rows.
+    result_counter: Counter = Counter(counts["results"])
+    my_counter: Counter = Counter(counts["my"])
+    opp_counter: Counter = Counter(counts["opp"])
+    rows: List[Tuple[str, str, str]] = list(counts["rows"])
+
+    for b in normalized_battles:
+        if "result" not in b:
+            raise ValueError("normalized_battles must include a 'result' field")
+        if "my_cards" not in b or "opp_cards" not in b:
+            raise ValueError("normalized_battles must include 'my_cards' and 'opp_cards'")
+
+        result = b["result"]
+        my_type = deck_type_mod.classify_deck_cached(b["my_cards"])
+        opp_type = deck_type_mod.classify_deck_cached(b["opp_cards"])
+
+        result_counter[result] += 1
+        my_counter[my_type] += 1
+        opp_counter[opp_type] += 1
+        rows.append((my_type, opp_type, result))
+
+    return {
+        "results": result_counter,
+        "my": my_counter,
+        "opp": opp_counter,
+        "rows": rows,
+    }
+
+
+def meta_analytics_from_counts(
+    counts: Dict[str, Any],
+    *,
+    include_matchups: bool = True,
+) -> Dict[str, Any]:
+    """
+    Build the compute_meta_analytics dict from accumulate_meta_counts output.
+
+    include_matchups=False skips the matchup matrix (deck_type_matchups is
+    left empty), for callers that only need summary + deck-type counts.
+
+    All counts come back as plain Python ints, so consumers need no casts.
+    """
+    rows = counts["rows"]
+    if not rows:
         empty_summary = {
             "games_played": 0,
             "wins": 0,
@@ -158,16 +205,12 @@ def compute_meta_analytics(normalized_battles: List[Dict[str, Any]]) -> Dict[str
             "deck_type_matchups": {},
         }
 
-    df = pd.DataFrame(normalized_battles)
-
     # --- Basic summary ---
-    if "result" not in df.columns:
-        raise ValueError("normalized_battles must include a 'result' field")
-
-    wins = int((df["result"] == "win").sum())
-    losses = int((df["result"] == "loss").sum())
-    draws = int((df["result"] == "draw").sum())
-    games = int(len(df))
+    result_counter = counts["results"]
+    wins = result_counter["win"]
+    losses = result_counter["loss"]
+    draws = result_counter["draw"]
+    games = len(rows)
 
     win_rate = float(wins / games) if games > 0 else 0.0
 
@@ -179,17 +222,9 @@ def compute_meta_analytics(normalized_battles: List[Dict[str, Any]]) -> Dict[str
         "win_rate": win_rate,
     }
 
-    # --- Deck-type classification for BOTH sides ---
-    if "my_cards" not in df.columns or "opp_cards" not in df.columns:
-        raise ValueError("normalized_battles must include 'my_cards' and 'opp_cards'")
-
-    df = df.copy()  # don't mutate caller's DataFrame
-    df["my_deck_type"] = df["my_cards"].apply(_classify_deck)
-    df["opp_deck_type"] = df["opp_cards"].apply(_classify_deck)
-
     # --- Count appearances separately for my / opp (useful for sanity checks) ---
-    my_counts = df["my_deck_type"].value_counts().to_dict()
-    opp_counts = df["opp_deck_type"].value_counts().to_dict()
+    my_counts = dict(counts["my"].most_common())
+    opp_counts = dict(counts["opp"].most_common())
 
     # Ensure all known deck types are present (with 0) for easier downstream logic
     for archetype in DECK_TYPES:
@@ -197,7 +232,7 @@ def compute_meta_analytics(normalized_battles: List[Dict[str, Any]]) -> Dict[str
         opp_counts.setdefault(archetype, 0)
 
     # --- Symmetric matchup matrix: deck_type vs opp_type, using BOTH sides ---
-    deck_type_matchups = _build_symmetric_matchup_matrix(df)
+    deck_type_matchups = _build_symmetric_matchup_matrix(rows) if include_matchups else {}
 
     analytics: Dict[str, Any] = {
         "summary": summary,
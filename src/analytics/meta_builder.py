@@ -1,8 +1,9 @@
 #src/analytics/meta_builder.py
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Optional
 
 from src.api.players import fetch_top_300_players
-from src.api.battles import get_player_battlelog
+from src.api.async_battles import fetch_battlelogs
 from src.analytics.battle_filters import filter_and_normalize_ranked_1v1
 from src.analytics.user_analytics import compute_user_analytics
 from src.analytics.plots import generate_card_plots
@@ -14,6 +15,8 @@ def build_meta_analytics(
     max_players: int = 300,
     sample_size: int = 50,
     per_player_matches: int = 10,
+    max_connections: int = 16,
+    seed: Optional[int] = None,
     verbose: bool = True,
 ) -> Dict[str, Any]:
     """
@@ -21,8 +24,9 @@ def build_meta_analytics(
 
     Steps (per spec):
       1) Fetch top ~300 global players.
-      2) Randomly sample 50 players.
-      3) For each sampled player:
+      2) Randomly sample 50 players (reproducible when `seed` is given).
+      3) For each sampled player (fetched concurrently over max_connections
+         pooled async connections):
            - Fetch battlelog.
            - Filter to ranked/Trophy Road 1v1.
            - Take last 10 valid matches.
@@ -44,42 +48,56 @@ def build_meta_analytics(
         print(f"Total players fetched: {len(top_players)}")
         print(f"Sampling {sample_size} players...")
 
-    sampled_players = sample_players(top_players, sample_size=sample_size)
+    sampled_players = sample_players(top_players, sample_size=sample_size, seed=seed)
 
     meta_battles: List[Dict[str, Any]] = []
+    total = len(sampled_players)
 
+    to_fetch: List[Any] = []
     for idx, player in enumerate(sampled_players, start=1):
         tag = player.get("tag")
         name = player.get("name", "")
 
         if not tag:
             if verbose:
-                print(f"[{idx}/{len(sampled_players)}] Skipping player with no tag.")
+                print(f"[{idx}/{total}] Skipping player with no tag.")
             continue
 
         if verbose:
-            print(f"[{idx}/{len(sampled_players)}] Fetching battles for {name} ({tag})...")
-
-        try:
-            raw_battles = get_player_battlelog(tag)
-            ranked_normalized = filter_and_normalize_ranked_1v1(raw_battles)
-
-            # Take the last N ranked matches (API returns most recent first)
-            player_slice = ranked_normalized[:per_player_matches]
-            meta_battles.extend(player_slice)
-
-            if verbose:
-                print(
-                    f"  -> {len(raw_battles)} raw battles, "
-                    f"{len(ranked_normalized)} ranked, "
-                    f"using {len(player_slice)} for meta."
-                )
-
-        except Exception as e:
+            print(f"[{idx}/{total}] Fetching battles for {name} ({tag})...")
+
+        to_fetch.append((idx, tag))
+
+    # Battlelog fetches are pure network I/O: fan them all out on one event
+    # loop with a shared async connection pool.
+    results = asyncio.run(
+        fetch_battlelogs(
+            [tag for _, tag in to_fetch],
+            max_connections=max_connections,
+            # Meta re-runs within a few minutes reuse the sampled battlelogs
+            use_cache=True,
+        )
+    )
+
+    for (idx, tag), raw_battles in zip(to_fetch, results):
+        if isinstance(raw_battles, BaseException):
             if verbose:
-                print(f"  !! Error fetching/processing player {tag}: {e}")
+                print(f"  !! Error fetching/processing player {tag}: {raw_battles}")
             continue
 
+        # Take the last N ranked matches (API returns most recent first);
+        # battles past the first N are never normalized
+        player_slice = filter_and_normalize_ranked_1v1(
+            raw_battles, limit=per_player_matches
+        )
+        meta_battles.extend(player_slice)
+
+        if verbose:
+            print(
+                f"  -> [{idx}/{total}] {tag}: {len(raw_battles)} raw battles, "
+                f"using {len(player_slice)} ranked for meta."
+            )
+
     if verbose:
         print(f"\nTotal meta battles collected: {len(meta_battles)}")
         print("Computing meta_analytics...")
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
+from ._encode import key_result_counts
+
 
 def build_meta_deck_summary(
     meta_table: List[Dict[str, Any]],
@@ -32,39 +34,30 @@ def build_meta_deck_summary(
           "sample_ok": bool,     # games >= min_games_per_type
         }
     """
-    stats: Dict[str, Dict[str, Any]] = {}
-
-    # First pass: count games / results per archetype
-    for row in meta_table:
-        deck_type = row.get("deck_type") or "Unknown"
-        result = row.get("result")
-
-        rec = stats.setdefault(
-            deck_type,
-            {
-                "deck_type": deck_type,
-                "games": 0,
-                "wins": 0,
-                "losses": 0,
-                "draws": 0,
-                "meta_share": 0.0,
-                "win_rate": 0.0,
-                "sample_ok": False,
-            },
-        )
-
-        rec["games"] += 1
-        if result == "win":
-            rec["wins"] += 1
-        elif result == "loss":
-            rec["losses"] += 1
-        elif result == "draw":
-            rec["draws"] += 1
+    # Columnar pass: per-archetype [games, wins, losses, draws] on int arrays
+    deck_types, counts = key_result_counts(
+        [row.get("deck_type") or "Unknown" for row in meta_table],
+        [row.get("result") for row in meta_table],
+    )
+
+    stats: Dict[str, Dict[str, Any]] = {
+        deck_type: {
+            "deck_type": deck_type,
+            "games": games,
+            "wins": wins,
+            "losses": losses,
+            "draws": draws,
+            "meta_share": 0.0,
+            "win_rate": 0.0,
+            "sample_ok": False,
+        }
+        for deck_type, (games, wins, losses, draws) in zip(deck_types, counts.tolist())
+    }
 
     if not stats:
         return []
 
-    # Second pass: compute meta_share, win_rate, sample_ok
+    # Final pass: compute meta_share, win_rate, sample_ok
     total_games = sum(rec["games"] for rec in stats.values()) or 1
     for rec in stats.values():
         games = rec["games"] or 0
@@ -2,30 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
 
-from . import deck_type as deck_type_mod
-
-
-def _classify_deck(cards: List[str]) -> str:
-    """
-    Same wrapper pattern as in meta_analytics.py so don't depend
-    on the exact function name in deck_type.py.
-    """
-    if hasattr(deck_type_mod, "classify_deck_from_cards"):
-        return deck_type_mod.classify_deck_from_cards(cards)  # type: ignore[attr-defined]
-    if hasattr(deck_type_mod, "classify_deck"):
-        return deck_type_mod.classify_deck(cards)  # type: ignore[attr-defined]
-    return "Hybrid"
-
-
-def _flip_result(res: str) -> str:
-    """Flip a result when swap POV: win<->loss, draw stays draw."""
-    if res == "win":
-        return "loss"
-    if res == "loss":
-        return "win"
-    return "draw"
+from ._encode import FLIPPED_RESULT
+from ._deck_type_pass import build_all_meta_outputs
 
 
 def build_standardized_meta_table(
@@ -50,29 +30,39 @@ def build_standardized_meta_table(
 
     This is the canonical table use for meta plots (no “my vs opp” labels,
     just “participants in the meta”).
+
+    Thin wrapper over _deck_type_pass.build_all_meta_outputs, which builds
+    this table in the same pass as the deck-type aggregations.
+
+    Raises:
+        The deck classification error for any battle that would be in the
+        table (malformed battles are skipped, as before).
     """
-    rows: List[Dict[str, Any]] = []
+    return build_all_meta_outputs(normalized_battles)["meta_table"]
 
-    for idx, battle in enumerate(normalized_battles):
-        result = battle.get("result")
-        my_cards = battle.get("my_cards")
-        opp_cards = battle.get("opp_cards")
 
-        # Skip malformed entries
-        if not isinstance(my_cards, list) or not isinstance(opp_cards, list):
-            continue
-        if result not in ("win", "loss", "draw"):
+def meta_table_from_rows(
+    normalized_battles: Sequence[Dict[str, Any]],
+    rows: Sequence[Tuple[str, str, str]],
+) -> List[Dict[str, Any]]:
+    """
+    Build the same table from already-classified battles.
+
+    `rows` are the (my_deck_type, opp_deck_type, result) tuples kept by
+    meta_analytics.accumulate_meta_counts, row i describing battle i, so no
+    deck is classified (or card list read) a second time. Battles are only
+    consulted for an optional 'battle_id'.
+    """
+    meta_table: List[Dict[str, Any]] = []
+    for idx, (battle, (my_type, opp_type, result)) in enumerate(
+        zip(normalized_battles, rows)
+    ):
+        opp_result = FLIPPED_RESULT.get(result)
+        if opp_result is None:
             continue
 
-        # Try to keep a stable id if one exists, otherwise use index
         battle_id = battle.get("battle_id", idx)
-
-        # Classify both decks type
-        my_type = _classify_deck(my_cards)
-        opp_type = _classify_deck(opp_cards)
-
-        # Row for the "my" side (top player)
-        rows.append(
+        meta_table.append(
             {
                 "battle_id": battle_id,
                 "battle_index": idx,
@@ -82,10 +72,7 @@ def build_standardized_meta_table(
                 "is_win": result == "win",
             }
         )
-
-        # Row for the opponent side (flip POV)
-        opp_result = _flip_result(result)
-        rows.append(
+        meta_table.append(
             {
                 "battle_id": battle_id,
                 "battle_index": idx,
@@ -95,5 +82,4 @@ def build_standardized_meta_table(
                 "is_win": opp_result == "win",
             }
         )
-
-    return rows
+    return meta_table
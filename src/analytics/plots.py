@@ -1,9 +1,15 @@
 #src/analytics/plots.py
 import os
-from typing import Any, Dict, List
-import matplotlib
-matplotlib.use("Agg") 
-import matplotlib.pyplot as plt
+import threading
+from typing import Any, Dict, List, Tuple
+
+# OO API only (no pyplot): Figure objects carry no global state, so plots can
+# be rendered from worker threads.
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .user_analytics import CARD_TOP_N
 
 PLOTS_DIR = "plots"
 
@@ -13,9 +19,45 @@ def _ensure_plots_dir() -> None:
     os.makedirs(PLOTS_DIR, exist_ok=True)
 
 
-def _top_n_cards(cards: List[Dict[str, Any]], n: int = 10) -> List[Dict[str, Any]]:
-    """Return top-n entries from a card stats list."""
-    return cards[:n]
+def _new_figure(figsize: Tuple[float, float]) -> Tuple[Figure, Axes]:
+    """Create a standalone Agg-backed figure with a single Axes."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    return fig, ax
+
+
+_local = threading.local()
+
+
+def _reused_figure(figsize: Tuple[float, float]) -> Tuple[Figure, Axes]:
+    """
+    Return this thread's figure for `figsize`, with its Axes cleared.
+
+    Building a Figure/Axes (and its tick/font setup) costs more than drawing a
+    small bar chart, so each thread keeps one figure per size and reuses it.
+    Thread-local, so concurrent plot calls never share a figure.
+    """
+    figures: Dict[Tuple[float, float], Tuple[Figure, Axes]] = getattr(_local, "figures", None)
+    if figures is None:
+        figures = _local.figures = {}
+
+    cached = figures.get(figsize)
+    if cached is None:
+        cached = figures[figsize] = _new_figure(figsize)
+    else:
+        cached[1].clear()
+    return cached
+
+
+def _save_png(fig: Figure, path: str, **kwargs: Any) -> None:
+    """
+    Save a figure as PNG with fast zlib compression.
+
+    Level 1 encodes several times faster than the default (6); for flat-colour
+    charts the files are barely larger.
+    """
+    fig.savefig(path, pil_kwargs={"compress_level": 1}, **kwargs)
 
 
 def plot_card_bar_chart(
@@ -42,21 +84,21 @@ def plot_card_bar_chart(
     if not cards:
         return os.path.join(PLOTS_DIR, f"{filename}.png")
 
-    top_cards = _top_n_cards(cards, n=10)
+    top_cards = cards[:CARD_TOP_N]
     labels = [c["card"] for c in top_cards]
     values = [c.get(metric, 0.0) for c in top_cards]
 
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig, ax = _reused_figure(figsize=(10, 5))
     ax.bar(labels, values)
     ax.set_title(title)
     ax.set_ylabel(metric.replace("_", " ").title())
     ax.set_xticklabels(labels, rotation=45, ha="right")
 
-    plt.tight_layout()
+    # Fixed margins instead of tight_layout(): no layout solver per chart
+    fig.subplots_adjust(bottom=0.3)
 
     path = os.path.join(PLOTS_DIR, f"{filename}.png")
-    fig.savefig(path)
-    plt.close(fig)
+    _save_png(fig, path)
 
     return path
 
@@ -87,13 +129,12 @@ def plot_deck_type_pie(
     labels = [d["type"] for d in deck_types]
     sizes = [d["games"] for d in deck_types]
 
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig, ax = _reused_figure(figsize=(6, 6))
     ax.pie(sizes, labels=labels, autopct="%1.1f%%")
     ax.set_title(title)
 
     path = os.path.join(PLOTS_DIR, f"{filename}.png")
-    fig.savefig(path)
-    plt.close(fig)
+    _save_png(fig, path)
 
     return path
 
@@ -125,18 +166,18 @@ def plot_deck_type_bar(
     labels = [d["type"] for d in deck_types]
     values = [d.get(metric, 0.0) for d in deck_types]
 
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig, ax = _reused_figure(figsize=(8, 4))
     ax.bar(labels, values)
     ax.set_title(title)
     ax.set_ylabel("Win Rate")
     ax.set_ylim(0, 1)
     ax.set_xticklabels(labels, rotation=45, ha="right")
 
-    plt.tight_layout()
+    # Fixed margins instead of tight_layout(): no layout solver per chart
+    fig.subplots_adjust(bottom=0.3)
 
     path = os.path.join(PLOTS_DIR, f"{filename}.png")
-    fig.savefig(path)
-    plt.close(fig)
+    _save_png(fig, path)
 
     return path
 
@@ -1,10 +1,20 @@
 #src/analytics/user_analytics.py
-from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .deck_type import summarize_deck_types, classify_deck
+from ._deck_type_pass import build_all_meta_outputs
+from ._encode import (
+    counting_codes,
+    encode_card_lists,
+    encode_result_column,
+    encode_results,
+    group_counts,
+)
+from .deck_type import DeckKey, deck_key
+
 
 def compute_deck_type_matchups(
     battles_normalized: List[Dict[str, Any]],
@@ -30,70 +40,14 @@ def compute_deck_type_matchups(
           "draws": 0,
           "win_rate": 1/6,
         }
-    """
-    stats: Dict[Tuple[str, str], Dict[str, int]] = {}
-
-    def _ensure_bucket(key: Tuple[str, str]) -> Dict[str, int]:
-        if key not in stats:
-            stats[key] = {"games": 0, "wins": 0, "losses": 0, "draws": 0}
-        return stats[key]
-
-    for battle in battles_normalized:
-        result = battle.get("result")
-        my_cards = battle.get("my_cards") or []
-        opp_cards = battle.get("opp_cards") or []
-
-        # Only trust full 8-card decks
-        try:
-            my_type = classify_deck(my_cards) if len(my_cards) == 8 else None
-        except Exception:
-            my_type = None
-
-        try:
-            opp_type = classify_deck(opp_cards) if len(opp_cards) == 8 else None
-        except Exception:
-            opp_type = None
-
-        if my_type is None or opp_type is None:
-            continue
-
-        key = (my_type, opp_type)
-        bucket = _ensure_bucket(key)
-        bucket["games"] += 1
-        if result == "win":
-            bucket["wins"] += 1
-        elif result == "loss":
-            bucket["losses"] += 1
-        else:
-            bucket["draws"] += 1
 
-    # Convert to list of dicts with win_rate
-    out: List[Dict[str, Any]] = []
-    for (my_type, opp_type), s in stats.items():
-        if s["games"] < min_games:
-            continue
-
-        games = s["games"]
-        wins = s["wins"]
-        losses = s["losses"]
-        draws = s["draws"]
-        win_rate = wins / games if games > 0 else 0.0
-
-        out.append(
-            {
-                "my_deck_type": my_type,
-                "opp_deck_type": opp_type,
-                "games": games,
-                "wins": wins,
-                "losses": losses,
-                "draws": draws,
-                "win_rate": win_rate,
-            }
-        )
-
-    # Sort: more games first, then higher winrate
-    out.sort(key=lambda d: (d["games"], d["win_rate"]), reverse=True)
-    return out
+    Thin wrapper over build_all_meta_outputs.
+    """
+    return build_all_meta_outputs(
+        battles_normalized,
+        min_matchup_games=min_games,
+        include_meta_table=False,
+    )["deck_type_matchups"]
 
 
 def compute_user_deck_matchups(
@@ -120,7 +74,7 @@ def compute_user_deck_matchups(
         }
     """
     # Aggregate stats per opponent deck, from *your* perspective
-    opp_decks: Dict[Tuple[str, ...], Dict[str, int]] = defaultdict(
+    opp_decks: Dict[DeckKey, Dict[str, int]] = defaultdict(
         lambda: {"games": 0, "wins": 0, "losses": 0, "draws": 0}
     )
 
@@ -130,8 +84,7 @@ def compute_user_deck_matchups(
         if not opp_cards:
             continue
 
-        deck_key = tuple(sorted(opp_cards))
-        s = opp_decks[deck_key]
+        s = opp_decks[deck_key(opp_cards)]
         s["games"] += 1
         if result == "win":
             s["wins"] += 1          # you won vs this deck
@@ -142,13 +95,13 @@ def compute_user_deck_matchups(
 
     # Convert to list with win_rate, filter by min_games
     rows: List[Dict[str, Any]] = []
-    for deck_key, s in opp_decks.items():
+    for key, s in opp_decks.items():
         if s["games"] < min_games:
             continue
         wr = s["wins"] / s["games"] if s["games"] > 0 else 0.0
         rows.append(
             {
-                "deck": list(deck_key),
+                "deck": sorted(key),
                 "games": s["games"],
                 "wins": s["wins"],
                 "losses": s["losses"],
@@ -175,6 +128,9 @@ def compute_user_deck_matchups(
     return tough, easy
 
 
+_BATTLE_COLUMNS = ["battle_time", "result", "my_cards", "opp_cards", "mode_name"]
+
+
 def build_battles_dataframe(
     battles_normalized: List[Dict[str, Any]]
 ) -> pd.DataFrame:
@@ -189,17 +145,24 @@ def build_battles_dataframe(
           "opp_cards": List[str],
           "mode_name": str,
         }
+
+    "result" and "mode_name" are categorical; missing fields become None.
+    An extra int8 "result_code" column (see _encode.encode_result_column)
+    lets downstream counts compare small integers instead of strings.
     """
-    if not battles_normalized:
-        return pd.DataFrame(
-            columns=["battle_time", "result", "my_cards", "opp_cards", "mode_name"]
-        )
+    # Column-first construction: one pass pulling parallel lists per column,
+    # instead of pandas inferring columns/dtypes from a list of row dicts.
+    cols: Dict[str, List[Any]] = {k: [] for k in _BATTLE_COLUMNS}
+    for b in battles_normalized:
+        for k, values in cols.items():
+            values.append(b.get(k))
 
-    df = pd.DataFrame(battles_normalized)
+    df = pd.DataFrame(cols)
+    df["result_code"] = encode_result_column(cols["result"])
 
-    for col in ["battle_time", "result", "my_cards", "opp_cards", "mode_name"]:
-        if col not in df.columns:
-            df[col] = None
+    # Low-cardinality strings -> category, so comparisons run on integer codes
+    df["result"] = df["result"].astype("category")
+    df["mode_name"] = df["mode_name"].astype("category")
 
     return df
 
@@ -207,6 +170,13 @@ def build_battles_dataframe(
 # ---------- Overall summary ----------
 
 
+def _result_codes(df: pd.DataFrame) -> np.ndarray:
+    """The frame's int8 result codes (encoded on the fly if "result_code" is missing)."""
+    if "result_code" in df:
+        return df["result_code"].to_numpy()
+    return encode_result_column(df["result"].tolist())
+
+
 def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
     """Compute overall performance summary."""
     total_games = len(df)
@@ -219,9 +189,10 @@ def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
             "win_rate": 0.0,
         }
 
-    wins = int((df["result"] == "win").sum())
-    losses = int((df["result"] == "loss").sum())
-    draws = int((df["result"] == "draw").sum())
+    codes = _result_codes(df)
+    wins = int((codes == 0).sum())
+    losses = int((codes == 1).sum())
+    draws = int((codes == 2).sum())
 
     win_rate = wins / total_games if total_games > 0 else 0.0
 
@@ -234,97 +205,200 @@ def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
+def compute_summary_from_list(battles_normalized: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Same as compute_summary, but one Counter pass over the battle dicts (no DataFrame)."""
+    counts = Counter(b.get("result") for b in battles_normalized)
+    total_games = len(battles_normalized)
+
+    wins = counts["win"]
+    win_rate = wins / total_games if total_games > 0 else 0.0
+
+    return {
+        "games_played": total_games,
+        "wins": wins,
+        "losses": counts["loss"],
+        "draws": counts["draw"],
+        "win_rate": win_rate,
+    }
+
+
 # ---------- Card-level stats ----------
 
 
-def _card_stats_from_rows(
-    rows: List[Dict[str, Any]],
+def _card_counts(
+    card_lists: List[List[str]],
+    result_codes: Any,
     min_games: int = 3,
-    sort_desc: bool = True,
-) -> List[Dict[str, Any]]:
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
     """
-    Helper to build card stats from rows like:
-        {"card": "Card Name", "result": "win" | "loss" | "draw"}
+    Count per-card [games, wins, losses, draws] from per-battle card lists and
+    the matching per-battle result codes (see _encode.encode_results).
+
+    Returns (card names, kept card ids, kept counts, kept win rates) for the
+    cards with at least `min_games` games, in first-seen order.
     """
-    stats: Dict[str, Dict[str, int]] = defaultdict(
-        lambda: {"games": 0, "wins": 0, "losses": 0, "draws": 0}
+    names, card_ids, lengths = encode_card_lists(card_lists)
+    counts = group_counts(card_ids, np.repeat(result_codes, lengths), len(names))
+
+    # Filter + win rate on the count array; only surviving cards become dicts
+    keep = np.nonzero(counts[:, 0] >= min_games)[0]
+    kept = counts[keep]
+    games_arr = kept[:, 0]
+    win_rates = np.divide(
+        kept[:, 1], games_arr, out=np.zeros(len(keep)), where=games_arr > 0
     )
+    return names, keep, kept, win_rates
 
-    for row in rows:
-        card = row["card"]
-        result = row["result"]
-        s = stats[card]
-        s["games"] += 1
-        if result == "win":
-            s["wins"] += 1
-        elif result == "loss":
-            s["losses"] += 1
-        else:
-            s["draws"] += 1
 
-    out: List[Dict[str, Any]] = []
-    for card, s in stats.items():
-        if s["games"] < min_games:
-            continue
-        wr = s["wins"] / s["games"] if s["games"] > 0 else 0.0
-        out.append(
-            {
-                "card": card,
-                "games": s["games"],
-                "wins": s["wins"],
-                "losses": s["losses"],
-                "draws": s["draws"],
-                "win_rate": wr,
-            }
-        )
+def _rank_cards(
+    win_rates: np.ndarray,
+    games: np.ndarray,
+    *,
+    descending: bool,
+    top_n: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Positions ordered by (win_rate, games), descending or ascending.
 
-    out.sort(key=lambda x: (x["win_rate"], x["games"]), reverse=sort_desc)
-    return out
+    Descending ties keep first-seen order and ascending is its exact reverse,
+    matching a stable list sort + reversed(). With `top_n`, only the cards
+    whose win rate reaches the top_n-th best (or worst) are sorted: an O(n)
+    partition instead of a full sort.
+    """
+    m = len(win_rates)
+    pos = np.arange(m)
+    if top_n is not None and 0 < top_n < m:
+        if descending:
+            threshold = np.partition(win_rates, m - top_n)[m - top_n]
+            pos = np.nonzero(win_rates >= threshold)[0]
+        else:
+            threshold = np.partition(win_rates, top_n - 1)[top_n - 1]
+            pos = np.nonzero(win_rates <= threshold)[0]
+
+    # np.lexsort: last key is the primary one
+    if descending:
+        order = np.lexsort((pos, -games[pos], -win_rates[pos]))
+    else:
+        order = np.lexsort((-pos, games[pos], win_rates[pos]))
+    return pos[order][:top_n]
+
+
+def _card_rows(
+    names: List[str],
+    keep: np.ndarray,
+    kept: np.ndarray,
+    win_rates: np.ndarray,
+    order: np.ndarray,
+) -> List[Dict[str, Any]]:
+    """Card stat dicts for the positions in `order`."""
+    return [
+        {
+            "card": names[i],
+            "games": games,
+            "wins": wins,
+            "losses": losses,
+            "draws": draws,
+            "win_rate": win_rate,
+        }
+        for i, (games, wins, losses, draws), win_rate in zip(
+            keep[order].tolist(), kept[order].tolist(), win_rates[order].tolist()
+        )
+    ]
 
 
-def compute_card_performance(df: pd.DataFrame, min_games: int = 3) -> Dict[str, Any]:
-    """
-    Compute card-level performance for:
-      - my cards  (best/worst)
-      - opponent cards (tough/easy)
+def _card_stats_from_lists(
+    card_lists: List[List[str]],
+    result_codes: Any,
+    min_games: int = 3,
+) -> List[Dict[str, Any]]:
     """
-    rows_my: List[Dict[str, Any]] = []
-    rows_opp: List[Dict[str, Any]] = []
+    Helper to build card stats from per-battle card lists and the matching
+    per-battle result codes (see _encode.encode_results).
 
-    for _, row in df.iterrows():
-        result = row["result"]
+    Sorted by (win_rate, games) descending.
+    """
+    names, keep, kept, win_rates = _card_counts(card_lists, result_codes, min_games)
+    order = _rank_cards(win_rates, kept[:, 0], descending=True)
+    return _card_rows(names, keep, kept, win_rates, order)
 
-        for card in row.get("my_cards", []) or []:
-            rows_my.append({"card": card, "result": result})
 
-        for card in row.get("opp_cards", []) or []:
-            if result == "win":
-                opp_result = "loss"
-            elif result == "loss":
-                opp_result = "win"
-            else:
-                opp_result = "draw"
-            rows_opp.append({"card": card, "result": opp_result})
+def _card_performance_from_lists(
+    result_codes: np.ndarray,
+    my_lists: List[Any],
+    opp_lists: List[Any],
+    min_games: int = 3,
+    top_n: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Card performance from parallel per-battle lists (no pandas involved).
 
-    my_stats_desc = _card_stats_from_rows(rows_my, min_games=min_games, sort_desc=True)
-    my_stats_asc = list(reversed(my_stats_desc))
+    result_codes is the per-battle result column from
+    _encode.encode_result_column.
 
-    opp_stats_desc = _card_stats_from_rows(
-        rows_opp, min_games=min_games, sort_desc=True
-    )
-    opp_stats_asc = list(reversed(opp_stats_desc))
+    top_n=None returns the full sorted lists; otherwise each list holds only
+    its top_n entries.
+    """
+    # Missing card lists (None / NaN) count as empty
+    my_lists = [c if isinstance(c, list) else [] for c in my_lists]
+    opp_lists = [c if isinstance(c, list) else [] for c in opp_lists]
+
+    out: Dict[str, Any] = {}
+    # Opponent cards are counted from the opponent's POV (result flipped)
+    for desc_key, asc_key, card_lists, codes in (
+        ("best_cards", "worst_cards", my_lists, counting_codes(result_codes)),
+        (
+            "tough_opp_cards",
+            "easy_opp_cards",
+            opp_lists,
+            counting_codes(result_codes, flipped=True),
+        ),
+    ):
+        names, keep, kept, win_rates = _card_counts(card_lists, codes, min_games)
+        games = kept[:, 0]
+        desc = _rank_cards(win_rates, games, descending=True, top_n=top_n)
+        asc = (
+            desc[::-1]
+            if top_n is None
+            else _rank_cards(win_rates, games, descending=False, top_n=top_n)
+        )
+        out[desc_key] = _card_rows(names, keep, kept, win_rates, desc)
+        out[asc_key] = _card_rows(names, keep, kept, win_rates, asc)
 
     return {
-        "best_cards": my_stats_desc,
-        "worst_cards": my_stats_asc,
-        "tough_opp_cards": opp_stats_desc,
-        "easy_opp_cards": opp_stats_asc,
+        key: out[key]
+        for key in ("best_cards", "worst_cards", "tough_opp_cards", "easy_opp_cards")
     }
 
 
+def compute_card_performance(
+    df: pd.DataFrame,
+    min_games: int = 3,
+    top_n: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Compute card-level performance for:
+      - my cards  (best/worst)
+      - opponent cards (tough/easy)
+
+    Pass top_n (e.g. CARD_TOP_N) to skip sorting the full card lists.
+    """
+    return _card_performance_from_lists(
+        _result_codes(df),
+        df["my_cards"].tolist(),
+        df["opp_cards"].tolist(),
+        min_games=min_games,
+        top_n=top_n,
+    )
+
+
 # ---------- Deck-level stats (exact deck lists) ----------
 
 
+# result -> counter slot in [games, wins, losses, draws]; anything else is a draw
+_MY_RESULT_IDX: Dict[str, int] = {"win": 1, "loss": 2}
+_OPP_RESULT_IDX: Dict[str, int] = {"win": 2, "loss": 1}
+
+
 def compute_deck_performance(
     battles_normalized: List[Dict[str, Any]], min_games: int = 3
 ) -> Dict[str, Any]:
@@ -333,52 +407,38 @@ def compute_deck_performance(
 
     Deck key = sorted tuple of 8 card names.
     """
-    my_decks: Dict[Tuple[str, ...], Dict[str, int]] = defaultdict(
-        lambda: {"games": 0, "wins": 0, "losses": 0, "draws": 0}
-    )
-    opp_decks: Dict[Tuple[str, ...], Dict[str, int]] = defaultdict(
-        lambda: {"games": 0, "wins": 0, "losses": 0, "draws": 0}
-    )
+    # Flat [games, wins, losses, draws] counters; list indexing beats string keys
+    my_decks: Dict[DeckKey, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    opp_decks: Dict[DeckKey, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
 
     for b in battles_normalized:
         result = b["result"]
-        my_key = tuple(sorted(b.get("my_cards", [])))
-        opp_key = tuple(sorted(b.get("opp_cards", [])))
+        my_key = deck_key(b.get("my_cards", []))
+        opp_key = deck_key(b.get("opp_cards", []))
 
         ms = my_decks[my_key]
-        ms["games"] += 1
-        if result == "win":
-            ms["wins"] += 1
-        elif result == "loss":
-            ms["losses"] += 1
-        else:
-            ms["draws"] += 1
+        ms[0] += 1
+        ms[_MY_RESULT_IDX.get(result, 3)] += 1
 
         os = opp_decks[opp_key]
-        os["games"] += 1
-        if result == "win":
-            os["losses"] += 1
-        elif result == "loss":
-            os["wins"] += 1
-        else:
-            os["draws"] += 1
+        os[0] += 1
+        os[_OPP_RESULT_IDX.get(result, 3)] += 1
 
     def _deck_dicts(
-        decks_stats: Dict[Tuple[str, ...], Dict[str, int]]
+        decks_stats: Dict[DeckKey, List[int]]
     ) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
-        for deck_key, s in decks_stats.items():
-            if s["games"] < min_games:
+        for key, (games, wins, losses, draws) in decks_stats.items():
+            if games < min_games:
                 continue
-            wr = s["wins"] / s["games"] if s["games"] > 0 else 0.0
             out.append(
                 {
-                    "deck": list(deck_key),
-                    "games": s["games"],
-                    "wins": s["wins"],
-                    "losses": s["losses"],
-                    "draws": s["draws"],
-                    "win_rate": wr,
+                    "deck": sorted(key),
+                    "games": games,
+                    "wins": wins,
+                    "losses": losses,
+                    "draws": draws,
+                    "win_rate": wins / games if games > 0 else 0.0,
                 }
             )
         out.sort(key=lambda x: (x["win_rate"], x["games"]), reverse=True)
@@ -389,23 +449,36 @@ def compute_deck_performance(
 
     return {
         "best_decks": my_decks_list,
-        "worst_decks": list(reversed(my_decks_list)),
+        "worst_decks": my_decks_list[::-1],
         "tough_matchups": opp_decks_list,
-        "easy_matchups": list(reversed(opp_decks_list)),
+        "easy_matchups": opp_decks_list[::-1],
     }
 
 
 # ---------- Main entrypoint ----------
 
+# How many cards the plots show per best/worst/tough/easy chart (and what
+# "top" means in the LLM card tables). Pass it as top_n_cards to have
+# compute_user_analytics sort / return only that many per list.
+CARD_TOP_N = 10
+
+# Below this many battles, building a DataFrame costs more than the analytics
+# themselves, so compute_user_analytics stays on plain lists.
+PANDAS_MIN_BATTLES = 5000
+
 
 def compute_user_analytics(
     battles_normalized: List[Dict[str, Any]],
     min_card_games: int = 3,
     min_deck_games: int = 3,
+    top_n_cards: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Main entrypoint for user analytics (and also meta analytics).
 
+    Card lists hold every card that passes min_card_games; pass top_n_cards
+    (e.g. CARD_TOP_N) to keep only that many per list.
+
     Returns dict:
 
         {
@@ -424,15 +497,34 @@ def compute_user_analytics(
           "plots": {...}
         }
     """
-    df = build_battles_dataframe(battles_normalized)
-
-    summary = compute_summary(df)
-    card_stats = compute_card_performance(df, min_games=min_card_games)
+    summary = compute_summary_from_list(battles_normalized)
+
+    if len(battles_normalized) < PANDAS_MIN_BATTLES:
+        # Small-N fast path: read the columns straight off the dicts
+        card_stats = _card_performance_from_lists(
+            encode_result_column(b.get("result") for b in battles_normalized),
+            [b.get("my_cards") for b in battles_normalized],
+            [b.get("opp_cards") for b in battles_normalized],
+            min_games=min_card_games,
+            top_n=top_n_cards,
+        )
+    else:
+        df = build_battles_dataframe(battles_normalized)
+        card_stats = compute_card_performance(
+            df, min_games=min_card_games, top_n=top_n_cards
+        )
     deck_stats = compute_deck_performance(
         battles_normalized, min_games=min_deck_games
     )
 
-    my_deck_types, opp_deck_types = summarize_deck_types(battles_normalized)
+    # Deck-type stats + deck-type matchups from one classification pass
+    type_outputs = build_all_meta_outputs(
+        battles_normalized,
+        min_matchup_games=1,  # you can bump this to 2–3 later if you want to filter tiny samples
+        include_meta_table=False,
+    )
+    my_deck_types = type_outputs["my_deck_types"]
+    opp_deck_types = type_outputs["opp_deck_types"]
 
     # Deck-level matchups from *your* perspective (kept for potential future use)
     overall_wr = summary.get("win_rate", 0.0)
@@ -444,10 +536,7 @@ def compute_user_analytics(
     )
 
     # NEW: deck-type vs deck-type matrix (what Phase 2 cares about)
-    deck_type_matchups = compute_deck_type_matchups(
-        battles_normalized,
-        min_games=1,  # you can bump this to 2–3 later if you want to filter tiny samples
-    )
+    deck_type_matchups = type_outputs["deck_type_matchups"]
 
     analytics: Dict[str, Any] = {
         "summary": summary,
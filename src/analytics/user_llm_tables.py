@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
 
 
 def build_user_deck_summary(
@@ -40,48 +43,40 @@ def build_user_deck_summary(
     if not isinstance(matchups, dict):
         return []
 
-    stats: Dict[str, Dict[str, Any]] = {}
-
     # Aggregate over all opponents for each "my" deck type
+    stats: List[Dict[str, Any]] = []
     for my_type, vs_dict in matchups.items():
         if not isinstance(vs_dict, dict):
             continue
 
-        rec = stats.setdefault(
-            my_type,
+        cells = [cell for cell in vs_dict.values() if isinstance(cell, dict)]
+        stats.append(
             {
                 "deck_type": my_type,
-                "games": 0,
-                "wins": 0,
-                "losses": 0,
-                "draws": 0,
+                "games": sum(int(cell.get("games", 0)) for cell in cells),
+                "wins": sum(int(cell.get("wins", 0)) for cell in cells),
+                "losses": sum(int(cell.get("losses", 0)) for cell in cells),
+                "draws": sum(int(cell.get("draws", 0)) for cell in cells),
                 "user_share": 0.0,
                 "win_rate": 0.0,
                 "sample_ok": False,
-            },
+            }
         )
 
-        for _opp_type, cell in vs_dict.items():
-            if not isinstance(cell, dict):
-                continue
-            rec["games"] += int(cell.get("games", 0))
-            rec["wins"] += int(cell.get("wins", 0))
-            rec["losses"] += int(cell.get("losses", 0))
-            rec["draws"] += int(cell.get("draws", 0))
-
     if not stats:
         return []
 
     # Compute totals and derived metrics
-    total_games = sum(rec["games"] for rec in stats.values()) or 1
-    for rec in stats.values():
+    total_games = sum(rec["games"] for rec in stats) or 1
+    for rec in stats:
         games = rec["games"] or 0
         rec["user_share"] = games / total_games if total_games > 0 else 0.0
         rec["win_rate"] = rec["wins"] / games if games > 0 else 0.0
         rec["sample_ok"] = games >= min_games_per_deck
 
     # Sort most-played decks first
-    return sorted(stats.values(), key=lambda r: r["games"], reverse=True)
+    stats.sort(key=itemgetter("games"), reverse=True)
+    return stats
 
 
 def _label_advantage(
@@ -100,6 +95,22 @@ def _label_advantage(
     return "even"
 
 
+def _label_advantages(
+    win_rates: Sequence[float],
+    *,
+    neutral: float = 0.5,
+    margin: float = 0.05,
+) -> List[str]:
+    """Vectorized _label_advantage over many win rates."""
+    wr = np.asarray(win_rates, dtype=np.float64)
+    labels = np.where(
+        wr >= neutral + margin,
+        "favored",
+        np.where(wr <= neutral - margin, "unfavored", "even"),
+    )
+    return labels.tolist()
+
+
 def build_user_matchup_summary(
     analytics: Dict[str, Any],
     *,
@@ -135,38 +146,27 @@ def build_user_matchup_summary(
     if not isinstance(matchups, dict):
         return []
 
-    rows: List[Dict[str, Any]] = []
-
-    for my_type, vs_dict in matchups.items():
-        if not isinstance(vs_dict, dict):
-            continue
+    rows: List[Dict[str, Any]] = [
+        {
+            "my_deck_type": my_type,
+            "opp_deck_type": opp_type,
+            "games": int(cell.get("games", 0)),
+            "wins": int(cell.get("wins", 0)),
+            "losses": int(cell.get("losses", 0)),
+            "draws": int(cell.get("draws", 0)),
+            "win_rate": float(cell.get("win_rate", 0.0)),
+        }
+        for my_type, vs_dict in matchups.items()
+        if isinstance(vs_dict, dict)
+        for opp_type, cell in vs_dict.items()
+        if isinstance(cell, dict) and int(cell.get("games", 0)) >= min_matchup_games
+    ]
 
-        for opp_type, cell in vs_dict.items():
-            if not isinstance(cell, dict):
-                continue
-
-            games = int(cell.get("games", 0))
-            if games < min_matchup_games:
-                continue
-
-            wins = int(cell.get("wins", 0))
-            losses = int(cell.get("losses", 0))
-            draws = int(cell.get("draws", 0))
-            win_rate = float(cell.get("win_rate", 0.0))
-
-            rows.append(
-                {
-                    "my_deck_type": my_type,
-                    "opp_deck_type": opp_type,
-                    "games": games,
-                    "wins": wins,
-                    "losses": losses,
-                    "draws": draws,
-                    "win_rate": win_rate,
-                    "advantage_label": _label_advantage(win_rate),
-                }
-            )
+    # Label all rows in one vectorized pass
+    labels = _label_advantages([row["win_rate"] for row in rows])
+    for row, label in zip(rows, labels):
+        row["advantage_label"] = label
 
     # Sort by games so the most meaningful matchups appear first
-    rows.sort(key=lambda r: r["games"], reverse=True)
+    rows.sort(key=itemgetter("games"), reverse=True)
     return rows
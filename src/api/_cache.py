@@ -0,0 +1,114 @@
+# src/api/_cache.py
+"""
+Small on-disk response cache for Clash Royale API data.
+
+Backed by diskcache (SQLite) when it is installed; otherwise by a bounded
+in-process LRU with the same TTLs, so repeat fetches within one process
+(e.g. workflow re-runs in the graph server) still skip the network.
+
+Both backends hand out independent copies (diskcache unpickles, the
+in-process LRU deep-copies on set and get), so a caller mutating a value
+never changes what later readers see.
+
+Battlelogs rarely change within a few minutes and the card catalog only
+changes on game patches, so re-runs of the meta builder / getcards can be
+served from .cache/ instead of re-fetching.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import diskcache  # optional: SQLite-backed cache
+except ImportError:
+    diskcache = None
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache"  # <project root>/.cache
+
+BATTLELOG_TTL = 300        # 5 minutes
+LEADERBOARD_TTL = 600      # 10 minutes
+CARDS_TTL = 24 * 60 * 60   # 24 hours
+ETAG_TTL = 24 * 60 * 60    # how long a stale body is kept for ETag revalidation
+
+# Max entries per namespace for the in-process fallback
+MEMORY_MAXSIZE = 4096
+
+_caches: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+# namespace -> key -> (expires_at, value), oldest first
+_memory: Dict[str, "OrderedDict[str, Tuple[float, Any]]"] = {}
+_memory_lock = threading.Lock()
+
+
+def _get_cache(namespace: str) -> Optional[Any]:
+    """Open (once) the diskcache.Cache for a namespace, or None if unavailable."""
+    if diskcache is None:
+        return None
+
+    cache = _caches.get(namespace)
+    if cache is None:
+        with _lock:
+            cache = _caches.get(namespace)
+            if cache is None:
+                cache = diskcache.Cache(str(CACHE_DIR / namespace))
+                _caches[namespace] = cache
+    return cache
+
+
+def _memory_get(namespace: str, key: str) -> Optional[Any]:
+    with _memory_lock:
+        entries = _memory.get(namespace)
+        if entries is None:
+            return None
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+    return copy.deepcopy(value)
+
+
+def _memory_set(namespace: str, key: str, value: Any, ttl: int) -> None:
+    value = copy.deepcopy(value)
+    with _memory_lock:
+        entries = _memory.setdefault(namespace, OrderedDict())
+        entries[key] = (time.monotonic() + ttl, value)
+        entries.move_to_end(key)
+        while len(entries) > MEMORY_MAXSIZE:
+            entries.popitem(last=False)
+
+
+def cache_get(namespace: str, key: str) -> Optional[Any]:
+    """Return the cached value, or None on a miss."""
+    cache = _get_cache(namespace)
+    if cache is None:
+        return _memory_get(namespace, key)
+    return cache.get(key)
+
+
+def cache_set(namespace: str, key: str, value: Any, ttl: int) -> None:
+    """Store value for ttl seconds."""
+    cache = _get_cache(namespace)
+    if cache is None:
+        _memory_set(namespace, key, value, ttl)
+        return
+    cache.set(key, value, expire=ttl)
+
+
+def get_or_fetch(namespace: str, key: str, ttl: int, fetch: Callable[[], Any]) -> Any:
+    """Return the cached value for key, calling fetch() and caching it on a miss."""
+    cached = cache_get(namespace, key)
+    if cached is not None:
+        return cached
+
+    value = fetch()
+    cache_set(namespace, key, value, ttl)
+    return value
@@ -0,0 +1,58 @@
+# src/api/_http.py
+"""
+Shared pooled HTTP session for the Clash Royale API.
+
+Every request to api.clashroyale.com goes through get_session() so repeated
+calls reuse one keep-alive TCP/TLS connection instead of handshaking each time.
+Auth headers are still added per call by the callers (see cr_client._get_headers),
+so a missing CR_API_KEY keeps failing loudly at request time.
+
+The session is created lazily and once per process: when the graph server
+forks worker processes, each worker opens its own connection pool instead of
+sharing sockets inherited from the parent.
+"""
+
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry transient API errors / rate limits with a small exponential backoff.
+# raise_on_status=False hands the final response back to the caller so the
+# existing status-code checks still produce their error messages.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    raise_on_status=False,
+)
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=_RETRY),
+    )
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return this process's pooled session, creating it on first use."""
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
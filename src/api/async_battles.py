@@ -0,0 +1,130 @@
+# src/api/async_battles.py
+"""
+Async battlelog fetching for large player fan-outs (e.g. the meta builder).
+
+One httpx.AsyncClient keeps a pool of keep-alive connections to
+api.clashroyale.com (multiplexed over HTTP/2 when the optional `h2` package
+is installed), and asyncio.gather runs all requests concurrently without a
+thread per request.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Union
+
+import httpx
+from urllib3.exceptions import InvalidHeader
+
+from . import _cache
+from ._http import _RETRY
+from .battles import _battlelog_path
+from .cr_client import BASE_URL, _get_headers, _throttle
+
+try:
+    import h2  # noqa: F401  (optional: enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+def make_async_client(max_connections: int = 16) -> httpx.AsyncClient:
+    """Pooled async client for the Clash Royale API."""
+    return httpx.AsyncClient(
+        http2=_HTTP2,
+        headers={"Accept": "application/json"},
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        # Retries connection failures; retryable status codes are handled by
+        # _get_with_retry (same policy as the sync session in _http)
+        transport=httpx.AsyncHTTPTransport(http2=_HTTP2, retries=3),
+        timeout=30,
+    )
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Retry-After when the server sends one, else _RETRY's exponential backoff."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return _RETRY.parse_retry_after(retry_after)
+        except InvalidHeader:
+            pass  # malformed header: fall back to backoff
+    return min(_RETRY.backoff_factor * (2 ** attempt), _RETRY.backoff_max)
+
+
+async def _get_with_retry(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """
+    GET with the sync session's status retries (_http._RETRY): up to
+    _RETRY.total retries on 429 / 5xx, honouring Retry-After. The last
+    response is returned as-is so the caller's status check reports it.
+    """
+    for attempt in range(_RETRY.total + 1):
+        # Same rate cap as the sync client; waits without blocking the event loop
+        delay = _throttle.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response = await client.get(url, headers=_get_headers())
+        if (
+            response.status_code not in _RETRY.status_forcelist
+            or attempt == _RETRY.total
+        ):
+            return response
+        await asyncio.sleep(_retry_delay(response, attempt))
+    return response
+
+
+async def get_player_battlelog_async(
+    client: httpx.AsyncClient,
+    player_tag: str,
+    *,
+    use_cache: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Async equivalent of battles.get_player_battlelog (same use_cache opt-in,
+    shared battlelog cache).
+
+    Raises:
+        RuntimeError if the response status code is not 200 (after retries).
+    """
+    path = _battlelog_path(player_tag)
+
+    if use_cache:
+        cached = _cache.cache_get("battlelogs", path)
+        if cached is not None:
+            return cached
+
+    response = await _get_with_retry(client, f"{BASE_URL}{path}")
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Clash Royale API error {response.status_code}: {response.text}"
+        )
+
+    data = response.json()
+    battles = data if isinstance(data, list) else data.get("items", [])
+
+    if use_cache:
+        _cache.cache_set("battlelogs", path, battles, _cache.BATTLELOG_TTL)
+    return battles
+
+
+async def fetch_battlelogs(
+    player_tags: Iterable[str],
+    max_connections: int = 16,
+    use_cache: bool = False,
+) -> List[Union[List[Dict[str, Any]], BaseException]]:
+    """
+    Fetch many battlelogs concurrently (use_cache: see get_player_battlelog).
+
+    Returns one entry per tag, in input order: the battle list, or the
+    exception raised for that tag (one bad player doesn't fail the batch).
+    """
+    async with make_async_client(max_connections=max_connections) as client:
+        return await asyncio.gather(
+            *(
+                get_player_battlelog_async(client, tag, use_cache=use_cache)
+                for tag in player_tags
+            ),
+            return_exceptions=True,
+        )
@@ -1,6 +1,7 @@
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
 
-from .cr_client import cr_get
+from . import _cache
+from .cr_client import cr_get, cr_iter_items
 
 
 def normalize_player_tag(tag: str) -> str:
@@ -17,7 +18,16 @@ def normalize_player_tag(tag: str) -> str:
     return cleaned
 
 
-def get_player_battlelog(player_tag: str) -> List[Dict[str, Any]]:
+def _battlelog_path(player_tag: str) -> str:
+    normalized = normalize_player_tag(player_tag)
+    # API expects '#' encoded as '%23'
+    encoded_tag = normalized.replace("#", "%23", 1)
+    return f"/players/{encoded_tag}/battlelog"
+
+
+def get_player_battlelog(
+    player_tag: str, *, use_cache: bool = False
+) -> List[Dict[str, Any]]:
     """
     Fetch the battlelog for a given player tag.
 
@@ -26,19 +36,53 @@ def get_player_battlelog(player_tag: str) -> List[Dict[str, Any]]:
 
     Args:
         player_tag: Player tag, with or without leading '#'.
+        use_cache: Serve / store the result in the battlelog cache for a few
+            minutes (see _cache.BATTLELOG_TTL). Off by default so interactive
+            runs always see the latest matches; bulk meta fetches opt in.
 
     Returns:
         List of battle dicts (raw API format).
     """
-    normalized = normalize_player_tag(player_tag)
-    # API expects '#' encoded as '%23'
-    encoded_tag = normalized.replace("#", "%23", 1)
+    path = _battlelog_path(player_tag)
+
+    def _fetch() -> List[Dict[str, Any]]:
+        data = cr_get(path)
+
+        #this endpoint returns a JSON array (list of battles)
+        if isinstance(data, list):
+            return data
+
+        # Fallback in case the response is wrapped
+        return data.get("items", [])
+
+    if not use_cache:
+        return _fetch()
+    return _cache.get_or_fetch("battlelogs", path, _cache.BATTLELOG_TTL, _fetch)
+
+
+def iter_player_battlelog(
+    player_tag: str, *, use_cache: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generator variant of get_player_battlelog (same use_cache opt-in).
+
+    Yields raw battle dicts one by one (stream-parsed when ijson is installed),
+    for callers that only iterate once, e.g. filter_and_normalize_ranked_1v1.
+    """
+    path = _battlelog_path(player_tag)
 
-    data = cr_get(f"/players/{encoded_tag}/battlelog")
+    if not use_cache:
+        yield from cr_iter_items(path)
+        return
 
-    #this endpoint returns a JSON array (list of battles)
-    if isinstance(data, list):
-        return data
+    cached = _cache.cache_get("battlelogs", path)
+    if cached is not None:
+        yield from cached
+        return
 
-    # Fallback in case the response is wrapped
-    return data.get("items", [])
+    # Keep a copy while streaming so the next call can be served from cache
+    battles: List[Dict[str, Any]] = []
+    for battle in cr_iter_items(path):
+        battles.append(battle)
+        yield battle
+    _cache.cache_set("battlelogs", path, battles, _cache.BATTLELOG_TTL)
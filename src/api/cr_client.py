@@ -1,16 +1,57 @@
 # src/api/cr_client.py
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlencode
 
-import requests
 from dotenv import load_dotenv
 
+from . import _cache
+from ._http import get_session
+
+try:
+    import ijson  # optional: stream-parse large JSON arrays
+except ImportError:
+    ijson = None
+
 # Load environment variables from .env
 load_dotenv()
 
 CR_API_KEY = os.getenv("CR_API_KEY")
 BASE_URL = "https://api.clashroyale.com/v1"
 
+# Client-side request rate cap (requests/second, 0 disables), shared by all
+# threads and the async fetcher, so fan-outs self-throttle instead of
+# bursting into 429s.
+MAX_REQUESTS_PER_SECOND = float(os.getenv("CR_MAX_RPS", "10"))
+
+
+class _Throttle:
+    """Hands out request slots at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next free slot; returns how many seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+            return slot - now
+
+    def wait(self) -> None:
+        """Block the calling thread until its slot comes up."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_throttle = _Throttle(MAX_REQUESTS_PER_SECOND)
+
 
 def _get_headers() -> Dict[str, str]:
     """Return auth headers for the Clash Royale API."""
@@ -21,13 +62,28 @@ def _get_headers() -> Dict[str, str]:
     return {"Authorization": f"Bearer {CR_API_KEY}"}
 
 
-def cr_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def _cache_key(path: str, params: Optional[Dict[str, Any]]) -> str:
+    """Cache key for a GET: path plus its query string with sorted params."""
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted(params.items()))}"
+
+
+def cr_get(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    ttl: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Low-level helper for GET requests to the Clash Royale API.
 
     Args:
         path: API path starting with '/v1/...'
         params: Optional query parameters.
+        ttl: If set, cache the parsed response on disk for this many seconds
+            (see _cache). Once it expires, a response that came with an ETag
+            is revalidated with If-None-Match instead of re-downloaded.
 
     Returns:
         Parsed JSON response as a dict.
@@ -36,14 +92,75 @@ def cr_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]
         RuntimeError if the response status code is not 200.
     """
     url = f"{BASE_URL}{path}"
-    response = requests.get(url, headers=_get_headers(), params=params, timeout=10)
+    headers = _get_headers()
+
+    key = etag_entry = None
+    if ttl is not None:
+        key = _cache_key(path, params)
+        cached = _cache.cache_get("responses", key)
+        if cached is not None:
+            return cached
+
+        etag_entry = _cache.cache_get("etags", key)
+        if etag_entry is not None:
+            headers["If-None-Match"] = etag_entry["etag"]
+
+    _throttle.wait()
+    response = get_session().get(url, headers=headers, params=params, timeout=10)
+
+    if response.status_code == 304 and etag_entry is not None:
+        data = etag_entry["data"]
+        _cache.cache_set("responses", key, data, ttl)
+        return data
 
     if response.status_code != 200:
         raise RuntimeError(
             f"Clash Royale API error {response.status_code}: {response.text}"
         )
 
-    return response.json()
+    data = response.json()
+    if key is not None:
+        _cache.cache_set("responses", key, data, ttl)
+        etag = response.headers.get("ETag")
+        if etag:
+            _cache.cache_set("etags", key, {"etag": etag, "data": data}, _cache.ETAG_TTL)
+    return data
+
+
+def cr_iter_items(path: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Like cr_get, but for endpoints that return a top-level JSON array:
+    yields the array elements one at a time.
+
+    With ijson installed, elements are parsed straight off the socket so the
+    full response body / Python tree is never held in memory at once.
+    Without it, falls back to a buffered response.json().
+
+    Raises:
+        RuntimeError if the response status code is not 200.
+    """
+    url = f"{BASE_URL}{path}"
+    _throttle.wait()
+    response = get_session().get(
+        url, headers=_get_headers(), params=params, timeout=10, stream=ijson is not None
+    )
+
+    with response:
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Clash Royale API error {response.status_code}: {response.text}"
+            )
+
+        if ijson is None:
+            data = response.json()
+            # Fallback in case the response is wrapped
+            items = data if isinstance(data, list) else data.get("items", [])
+            yield from items
+            return
+
+        # Let urllib3 undo any gzip/deflate transfer encoding before ijson reads it
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, "item", use_float=True)
 
 LEADERBOARD_GLOBAL_ID = 170000005  #Rank 1v1 ( not trophi road)
 
@@ -56,8 +173,10 @@ def get_global_top_players(limit: int = 300) -> Dict[str, Any]:
         GET /leaderboard/{leaderboardId}?limit=...
 
     leaderboardId 170000005 = global trophy leaderboard (per CR docs).
+
+    Cached on disk for a few minutes (see _cache.LEADERBOARD_TTL).
     """
     params: Dict[str, Any] = {"limit": limit}
     path = f"/leaderboard/{LEADERBOARD_GLOBAL_ID}"
-    return cr_get(path, params=params)
+    return cr_get(path, params=params, ttl=_cache.LEADERBOARD_TTL)
 
@@ -8,10 +8,22 @@ the rest of the project doesn't need to worry about API keys,
 client setup, etc.
 """
 
-import os
+import hashlib
 import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 
-from openai import OpenAI
+try:
+    import h2  # noqa: F401  (optional: enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 
 try:
     from dotenv import load_dotenv
@@ -20,6 +32,20 @@ except ImportError:
     pass
 
 
+# Built-in SDK retries: exponential backoff on 429 / 5xx / connection errors
+_MAX_RETRIES = 5
+
+# Keep-alive pool of the shared client (classifier + expert calls)
+_MAX_CONNECTIONS = 20
+_MAX_KEEPALIVE = 10
+
+# Content-addressed response cache (one file per prompt hash). Entries expire
+# after LLM_CACHE_TTL seconds and the oldest are evicted past
+# _CACHE_MAX_ENTRIES, so the directory stays bounded.
+_CACHE_DIR = Path(os.getenv("LLM_CACHE", ".llm_cache"))
+_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 60 * 60)))  # 7 days
+_CACHE_MAX_ENTRIES = 2000
+
 _client: OpenAI | None = None
 
 
@@ -31,19 +57,101 @@ def get_openai_client() -> OpenAI:
     """
     global _client
     if _client is None:
-        # The OpenAI client will read OPENAI_API_KEY from env.
-        _client = OpenAI()
+        # The OpenAI client will read OPENAI_API_KEY from env. One pooled
+        # (HTTP/2 when h2 is installed) connection set is reused by every
+        # call, so only the first request pays the TLS handshake.
+        _client = OpenAI(
+            max_retries=_MAX_RETRIES,
+            http_client=DefaultHttpxClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=_MAX_CONNECTIONS,
+                    max_keepalive_connections=_MAX_KEEPALIVE,
+                ),
+            ),
+        )
     return _client
 
 
-def chat_completion(model: str, system_prompt: str, user_prompt: str, max_tokens: int = 600) -> str:
+def _cache_key(model: str, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+    payload = json.dumps([model, system_prompt, user_prompt, max_tokens])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_read(key: str) -> Optional[str]:
+    path = _CACHE_DIR / key
+    try:
+        if time.time() - path.stat().st_mtime > _CACHE_TTL:
+            path.unlink()
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _cache_prune() -> None:
+    """Drop the oldest entries once the cache holds more than _CACHE_MAX_ENTRIES."""
+    entries = [e for e in os.scandir(_CACHE_DIR) if not e.name.startswith(".tmp-")]
+    if len(entries) <= _CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[: len(entries) - _CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def _cache_write(key: str, content: str) -> None:
+    """Atomic write (temp file + os.replace) so readers never see partial files."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, _CACHE_DIR / key)
+        _cache_prune()
+    except OSError:
+        # Caching is best-effort; never fail the request because of it
+        pass
+
+
+def _messages(system_prompt: str, user_prompt: str) -> list:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def chat_completion(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 600,
+    use_cache: bool = True,
+) -> str:
+    """
+    Single chat completion, returning the message text.
+
+    With use_cache, identical (model, prompts, max_tokens) calls are answered
+    from the on-disk cache for up to LLM_CACHE_TTL: only use it for lookups
+    that depend on the prompt alone, like the classifier, not for answers
+    that depend on data that changes.
+    """
+    key = _cache_key(model, system_prompt, user_prompt, max_tokens)
+    if use_cache:
+        cached = _cache_read(key)
+        if cached is not None:
+            return cached
+
     client = get_openai_client()
     resp = client.chat.completions.create(
         model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
+        messages=_messages(system_prompt, user_prompt),
         max_tokens=max_tokens,
     )
-    return resp.choices[0].message.content
+    content = resp.choices[0].message.content
+
+    if use_cache and content is not None:
+        _cache_write(key, content)
+    return content
@@ -21,3 +21,8 @@ def fetch_top_players(limit = 300) -> List[Dict[str, Any]]:
         return []
 
     return items
+
+
+def fetch_top_300_players() -> List[Dict[str, Any]]:
+    """Top 300 global ladder players (used by meta_builder)."""
+    return fetch_top_players(limit=300)
@@ -1,5 +1,24 @@
-import random
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+import numpy as np
+
+# Shared generator for unseeded sampling
+_RNG = np.random.default_rng()
+
+
+def sample_indices(
+    population: Union[int, np.ndarray],
+    k: int,
+    rng: Optional[np.random.Generator] = None,
+) -> List[int]:
+    """
+    Pick k distinct indices without replacement.
+
+    population is either a size n (sample from range(n), without building
+    that range) or an int array of candidate indices.
+    """
+    rng = rng if rng is not None else _RNG
+    return rng.choice(population, size=k, replace=False).tolist()
 
 
 def sample_players(
@@ -18,8 +37,7 @@ def sample_players(
     Returns:
         List of sampled player dicts.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = np.random.default_rng(seed) if seed is not None else _RNG
 
     if len(players) < sample_size:
         raise ValueError(
@@ -27,5 +45,5 @@ def sample_players(
             f"need {sample_size}"
         )
 
-    indices = random.sample(range(len(players)), sample_size)
+    indices = sample_indices(len(players), sample_size, rng)
     return [players[i] for i in indices]
@@ -2,33 +2,42 @@
 
 from __future__ import annotations
 
-import random
-from typing import Any, Dict, List, Set
-from typing import TypedDict
-
-import matplotlib
-matplotlib.use("Agg") 
+import asyncio
+import operator
 import os
-import matplotlib.pyplot as plt
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, List, Optional, Set, Union
+from typing import Annotated, TypedDict
 
+import numpy as np
 from langgraph.graph import StateGraph, END
 
 from src.api.players import fetch_top_players
-from src.api.battles import get_player_battlelog
+from src.api.async_battles import fetch_battlelogs
+from src.api.battles import iter_player_battlelog
 from src.analytics.battle_filters import filter_and_normalize_ranked_1v1
-from src.analytics.meta_analytics import compute_meta_analytics
-from src.analytics.meta_standardize import build_standardized_meta_table
+from src.analytics._encode import key_result_counts
+from src.analytics.meta_analytics import (
+    accumulate_meta_counts,
+    meta_analytics_from_counts,
+)
+from src.analytics.meta_standardize import meta_table_from_rows
 from src.analytics.plots import (
     plot_deck_type_pie,
     plot_deck_type_bar,
     PLOTS_DIR,
     _ensure_plots_dir,
+    _reused_figure,
+    _save_png,
 )
 
 from src.analytics.meta_llm_tables import (
     build_meta_deck_summary,
     build_meta_matchup_summary,
 )
+from src.utils.sampling import sample_indices
 
 
 
@@ -39,6 +48,22 @@ from src.analytics.meta_llm_tables import (
 MIN_TOTAL_BATTLES = 2000
 MIN_GAMES_PER_TYPE = 200
 
+# Concurrent battlelog fetches (kept <= the HTTP session's pool_maxsize)
+FETCH_MAX_WORKERS = 16
+
+# Threads rendering the meta plots. Agg drawing/PNG encoding spends much of
+# its time in C with the GIL released, and threads avoid the process startup
+# and pickling a ProcessPoolExecutor would add for a handful of charts.
+PLOT_MAX_WORKERS = 4
+
+# Per-deck matchup charts are 8x5in; 100 dpi (800x500 px) is plenty on screen
+# and encodes ~2.25x fewer pixels than 150.
+MATCHUP_PLOT_DPI = 100
+
+# Fetch battlelogs on one asyncio loop (httpx) instead of a thread pool.
+# Set META_FETCH_ASYNC=0 to use the threaded requests path for debugging.
+FETCH_ASYNC = os.getenv("META_FETCH_ASYNC", "1") != "0"
+
 # Internal names are lowercased for robustness
 REQUIRED_DECK_TYPES_LOWER = [
     "siege",
@@ -63,22 +88,24 @@ class MetaState(TypedDict, total=False):
     top_players: List[Dict[str, Any]]          # full top-player list from API
     selected_players: List[Dict[str, Any]]     # batch currently being fetched
     used_player_indices: Set[int]              # indices into top_players already used
+    unused_player_indices: Set[int]            # complement of used_player_indices
     fetched_player_tags: Set[str]              # tags we've fetched logs for
 
     # Battles
     meta_raw_battles: List[Dict[str, Any]]     # all normalized ranked 1v1 battles
-    normalized_battles: List[Dict[str, Any]]   # alias / copy of meta_raw_battles
 
     # Analytics summary (from meta_analytics)
     meta_analytics: Dict[str, Any]
+    meta_counts: Dict[str, Any]                # running accumulate_meta_counts output
+    last_analyzed_idx: int                     # meta_raw_battles[:idx] already counted
 
     # Loop / control
     is_balanced: bool                          # True when all conditions are satisfied
     loop_count: int                            # number of "+5 players" loops
     stop_decision: str                         # "enough" | "need_more" | "stop"
 
-    # Logging
-    notes: List[str]
+    # Logging (append-only: nodes return just their new notes)
+    notes: Annotated[List[str], operator.add]
 
     # Standardized participant-level meta table (built after loop)
     meta_table: List[Dict[str, Any]]
@@ -91,9 +118,76 @@ class MetaState(TypedDict, total=False):
 # ---------------------------------------------------------------------------
 
 
+def _plot_matchups_for_attacker(
+    attacker_type: str,
+    rows: List[Dict[str, Any]],
+    filename_prefix: str,
+) -> Optional[str]:
+    """
+    Render one attacker_type's win-rate-vs-defender bar chart.
+    Returns the PNG path, or None if there is nothing to plot.
+    """
+    # Total games for this archetype (including mirror + non-mirror)
+    total_games_for_deck = sum(int(r.get("games", 0)) for r in rows)
+
+    # Exclude mirror from what we actually *plot*
+    rows_non_mirror = [
+        r for r in rows
+        if r.get("attacker_type") != r.get("defender_type")
+    ]
+
+    if not rows_non_mirror:
+        # If there are only mirrors, just skip plotting for this deck
+        return None
+
+    # Sort by win_rate descending so strongest matchups appear first
+    rows_non_mirror = sorted(
+        rows_non_mirror,
+        key=lambda r: float(r.get("win_rate", 0.0)),
+        reverse=True,
+    )
+
+    defenders = [r["defender_type"] for r in rows_non_mirror]
+    win_rates_pct = [float(r.get("win_rate", 0.0)) * 100.0 for r in rows_non_mirror]
+
+    x = list(range(len(defenders)))
+
+    # Per-thread figure, cleared between attacker types
+    fig, ax = _reused_figure(figsize=(8, 5))
+    bars = ax.bar(x, win_rates_pct)
+    ax.set_xticks(x)
+    ax.set_xticklabels(defenders, rotation=30, ha="right")
+    ax.set_ylabel("Win rate (%)")
+    ax.set_xlabel("Opponent deck type")
+
+    ax.set_title(
+        f"{attacker_type} vs other deck types "
+        f"(meta win rates, {total_games_for_deck} games)"
+    )
+
+    # Label each bar with WR% (one bar_label call instead of a Text per bar)
+    ax.bar_label(
+        bars,
+        labels=[f"{rate:.1f}%" for rate in win_rates_pct],
+        padding=2,
+        fontsize=8,
+    )
+
+    fig.tight_layout()
+
+    safe_name = attacker_type.lower().replace(" ", "_")
+    filename = f"{filename_prefix}_{safe_name}.png"
+    path = os.path.join(PLOTS_DIR, filename)
+    _save_png(fig, path, dpi=MATCHUP_PLOT_DPI)
+
+    return path
+
+
 def _plot_meta_matchups_by_deck(
     matchup_summary: List[Dict[str, Any]],
     filename_prefix: str = "meta_matchups",
+    max_workers: int = 4,
+    executor: Optional[Executor] = None,
 ) -> Dict[str, str]:
     """
     For each deck type (attacker_type), create a bar chart of win rate vs
@@ -103,6 +197,11 @@ def _plot_meta_matchups_by_deck(
       - Mirror matchups (attacker_type == defender_type) are NOT shown.
       - Bar labels show WR% (not #games).
       - Title includes total games for that deck type.
+      - Charts are rendered concurrently; each worker thread reuses one
+        figure (cleared per chart) instead of building a new one.
+
+    Pass `executor` to render on an existing pool (max_workers is then
+    ignored); otherwise a pool of max_workers threads is created.
     """
     if not matchup_summary:
         return {}
@@ -118,68 +217,26 @@ def _plot_meta_matchups_by_deck(
             continue
         by_attacker.setdefault(attacker, []).append(row)
 
-    plot_paths: Dict[str, str] = {}
-
-    for attacker_type, rows in by_attacker.items():
-        if not rows:
-            continue
-
-        # Total games for this archetype (including mirror + non-mirror)
-        total_games_for_deck = sum(int(r.get("games", 0)) for r in rows)
-
-        # Exclude mirror from what we actually *plot*
-        rows_non_mirror = [
-            r for r in rows
-            if r.get("attacker_type") != r.get("defender_type")
-        ]
-
-        if not rows_non_mirror:
-            # If there are only mirrors, just skip plotting for this deck
-            continue
-
-        # Sort by win_rate descending so strongest matchups appear first
-        rows_non_mirror = sorted(
-            rows_non_mirror,
-            key=lambda r: float(r.get("win_rate", 0.0)),
-            reverse=True,
-        )
-
-        defenders = [r["defender_type"] for r in rows_non_mirror]
-        win_rates_pct = [float(r.get("win_rate", 0.0)) * 100.0 for r in rows_non_mirror]
-
-        x = list(range(len(defenders)))
-
-        plt.figure(figsize=(8, 5))
-        plt.bar(x, win_rates_pct)
-        plt.xticks(x, defenders, rotation=30, ha="right")
-        plt.ylabel("Win rate (%)")
-        plt.xlabel("Opponent deck type")
-
-        plt.title(
-            f"{attacker_type} vs other deck types "
-            f"(meta win rates, {total_games_for_deck} games)"
-        )
-
-        # Label each bar with WR%
-        for xi, rate in enumerate(win_rates_pct):
-            plt.text(
-                xi,
-                rate + 1.0,
-                f"{rate:.1f}%",
-                ha="center",
-                va="bottom",
-                fontsize=8,
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max_workers) as own_executor:
+            return _plot_meta_matchups_by_deck(
+                matchup_summary, filename_prefix, executor=own_executor
             )
 
-        plt.tight_layout()
-
-        safe_name = attacker_type.lower().replace(" ", "_")
-        filename = f"{filename_prefix}_{safe_name}.png"
-        path = os.path.join(PLOTS_DIR, filename)
-        plt.savefig(path, dpi=150)
-        plt.close()
+    futures = {
+        attacker_type: executor.submit(
+            _plot_matchups_for_attacker, attacker_type, rows, filename_prefix
+        )
+        for attacker_type, rows in by_attacker.items()
+        if rows
+    }
 
-        plot_paths[attacker_type] = path
+    # Collect in attacker order so plot_paths stays deterministic
+    plot_paths: Dict[str, str] = {}
+    for attacker_type, future in futures.items():
+        path = future.result()
+        if path:
+            plot_paths[attacker_type] = path
 
     return plot_paths
 
@@ -193,7 +250,7 @@ def fetch_top_players_node(state: MetaState) -> Dict[str, Any]:
     """
     Fetch top players from the Clash Royale API and initialise state.
     """
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
 
     # Fetch top 1000 player
     top_players = fetch_top_players(limit=1000)
@@ -203,10 +260,12 @@ def fetch_top_players_node(state: MetaState) -> Dict[str, Any]:
         "top_players": top_players,
         "selected_players": [],
         "used_player_indices": set(),
+        "unused_player_indices": set(range(len(top_players))),
         "fetched_player_tags": set(),
         "meta_raw_battles": [],
-        "normalized_battles": [],
         "meta_analytics": {},
+        "meta_counts": {},
+        "last_analyzed_idx": 0,
         "meta_table": [],          
         "meta_llm_tables": {},   
         "is_balanced": False,
@@ -216,20 +275,37 @@ def fetch_top_players_node(state: MetaState) -> Dict[str, Any]:
     }
 
 
+def _unused_indices(state: MetaState) -> Set[int]:
+    """Copy of the state's unused player indices (derived from used ones if absent)."""
+    unused = state.get("unused_player_indices")
+    if unused is not None:
+        return set(unused)
+    used = state.get("used_player_indices", set())
+    return set(range(len(state.get("top_players", [])))) - set(used)
+
+
+def _sample_unused(unused: Set[int], k: int) -> List[int]:
+    """Sample k indices from `unused` and remove them from it."""
+    pool = np.fromiter(unused, dtype=np.int64, count=len(unused))
+    picks = sample_indices(pool, k)
+    unused.difference_update(picks)
+    return picks
+
+
 def sample_initial_node(state: MetaState) -> Dict[str, Any]:
     """
     Randomly sample 50 players from top_players to form the initial meta cohort.
     """
     top_players = state.get("top_players", [])
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
 
     if not top_players:
         notes.append("sample_initial: WARNING – top_players is empty.")
         return {"selected_players": [], "notes": notes}
 
-    all_indices = list(range(len(top_players)))
-    sample_size = min(250, len(all_indices))
-    sampled_indices = random.sample(all_indices, sample_size)
+    unused_indices = _unused_indices(state)
+    sample_size = min(250, len(unused_indices))
+    sampled_indices = _sample_unused(unused_indices, sample_size)
 
     selected_players = [top_players[i] for i in sampled_indices]
     used_indices: Set[int] = set(state.get("used_player_indices", set()))
@@ -243,6 +319,7 @@ def sample_initial_node(state: MetaState) -> Dict[str, Any]:
     return {
         "selected_players": selected_players,
         "used_player_indices": used_indices,
+        "unused_player_indices": unused_indices,
         "notes": notes,
     }
 
@@ -254,25 +331,26 @@ def sample_more_5_node(state: MetaState) -> Dict[str, Any]:
     top_players = state.get("top_players", [])
     used_indices: Set[int] = set(state.get("used_player_indices", set()))
     loop_count = state.get("loop_count", 0)
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
 
     if not top_players:
         notes.append("sample_more_5: WARNING – top_players is empty.")
         return {"selected_players": [], "notes": notes}
 
-    all_indices = list(range(len(top_players)))
-    unused_indices = [i for i in all_indices if i not in used_indices]
+    # Tracked directly in state: no O(n) rescan of used indices per loop
+    unused_indices = _unused_indices(state)
 
     if not unused_indices:
         notes.append("sample_more_5: no unused players left; cannot sample more.")
         return {
             "selected_players": [],
             "used_player_indices": used_indices,
+            "unused_player_indices": unused_indices,
             "notes": notes,
         }
 
     sample_size = min(5, len(unused_indices))
-    new_indices = random.sample(unused_indices, sample_size)
+    new_indices = _sample_unused(unused_indices, sample_size)
     selected_players = [top_players[i] for i in new_indices]
 
     used_indices.update(new_indices)
@@ -286,26 +364,109 @@ def sample_more_5_node(state: MetaState) -> Dict[str, Any]:
     return {
         "selected_players": selected_players,
         "used_player_indices": used_indices,
+        "unused_player_indices": unused_indices,
         "loop_count": loop_count,
         "notes": notes,
     }
 
 
+# Most recent ranked 1v1 games kept per player
+BATTLES_PER_PLAYER = 10
+
+
+def _recent_ranked(raw_battles: Any) -> List[Dict[str, Any]]:
+    """Keep up to 10 most recent ranked 1v1 games from a raw battlelog."""
+    # Stops normalizing once 10 ranked games are found
+    return filter_and_normalize_ranked_1v1(raw_battles, limit=BATTLES_PER_PLAYER)
+
+
+def _fetch_recent_ranked(tag: str) -> List[Dict[str, Any]]:
+    """Fetch one player's battlelog and keep up to 10 most recent ranked 1v1 games."""
+    # Filter while the battlelog streams in; the raw list is never built.
+    # No early exit here: the stream must be read to the end so the
+    # battlelog gets cached and the connection goes back to the pool.
+    normalized = filter_and_normalize_ranked_1v1(
+        iter_player_battlelog(tag, use_cache=True)
+    )
+    return normalized[:BATTLES_PER_PLAYER]
+
+
+def _fetch_recent_ranked_many(
+    tags: List[str],
+) -> List[Union[List[Dict[str, Any]], BaseException]]:
+    """
+    Fetch + filter many battlelogs concurrently.
+
+    Returns one entry per tag, in order: its recent ranked battles, or the
+    exception raised while fetching it.
+    """
+    try:
+        asyncio.get_running_loop()
+        in_event_loop = True
+    except RuntimeError:
+        in_event_loop = False
+
+    # asyncio.run can't nest inside a running loop; use threads there
+    if FETCH_ASYNC and not in_event_loop:
+        raw_results = asyncio.run(
+            fetch_battlelogs(tags, max_connections=FETCH_MAX_WORKERS)
+        )
+        results: List[Union[List[Dict[str, Any]], BaseException]] = []
+        for raw in raw_results:
+            if isinstance(raw, BaseException):
+                results.append(raw)
+                continue
+            try:
+                results.append(_recent_ranked(raw))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    # Threaded path: each worker streams its battlelog over the shared
+    # keep-alive session.
+    with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as executor:
+        futures = [executor.submit(_fetch_recent_ranked, tag) for tag in tags]
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+
 def fetch_meta_battles_node(state: MetaState) -> Dict[str, Any]:
     """
     For each selected player, fetch their battlelog and add up to the 10 most
     recent ranked 1v1 battles (normalized) to meta_raw_battles.
     """
     selected = state.get("selected_players", [])
-    notes = list(state.get("notes", []))
-    meta_raw = list(state.get("meta_raw_battles", []))
+    notes: List[str] = []
     fetched_tags: Set[str] = set(state.get("fetched_player_tags", set()))
 
     if not selected:
+        # meta_raw_battles is left as-is (no copy)
         notes.append("fetch_meta_battles: no selected_players; nothing to fetch.")
         return {
-            "meta_raw_battles": meta_raw,
-            "normalized_battles": meta_raw,
+            "fetched_player_tags": fetched_tags,
+            "notes": notes,
+        }
+
+    # Unique, not-yet-fetched tags in selection order
+    tags_to_fetch: List[str] = list(dict.fromkeys(
+        tag
+        for tag in (player.get("tag") for player in selected)
+        if tag and tag not in fetched_tags
+    ))
+
+    if not tags_to_fetch:
+        # Every selected player was fetched in a previous loop
+        notes.append(
+            "fetch_meta_battles: all selected players already fetched; "
+            "nothing to fetch."
+        )
+        return {
             "fetched_player_tags": fetched_tags,
             "notes": notes,
         }
@@ -313,32 +474,24 @@ def fetch_meta_battles_node(state: MetaState) -> Dict[str, Any]:
     new_battle_count = 0
     new_player_count = 0
 
-    for player in selected:
-        tag = player.get("tag")
-        if not tag:
-            continue
-
-        if tag in fetched_tags:
-            # Already fetched this player in a previous loop
+    # Battlelog fetches are network-bound: run them concurrently, then merge
+    # results in selection order.
+    new_batches: List[List[Dict[str, Any]]] = []
+    for tag, result in zip(tags_to_fetch, _fetch_recent_ranked_many(tags_to_fetch)):
+        if isinstance(result, BaseException):
+            notes.append(
+                f"fetch_meta_battles: error fetching {tag}: {str(result)}"
+            )
             continue
 
-        try:
-            raw_log = get_player_battlelog(tag)
-            normalized = filter_and_normalize_ranked_1v1(raw_log)
-
-            # Take up to 10 most recent ranked 1v1 games
-            take_n = min(len(normalized), 10)
-            recent_ranked = normalized[:take_n]
+        new_batches.append(result)
+        new_battle_count += len(result)
+        new_player_count += 1
+        fetched_tags.add(tag)
 
-            meta_raw.extend(recent_ranked)
-            new_battle_count += len(recent_ranked)
-            new_player_count += 1
-            fetched_tags.add(tag)
-
-        except Exception as e:
-            notes.append(
-                f"fetch_meta_battles: error fetching {tag}: {str(e)}"
-            )
+    # One new list (previous battles + all new batches) built in a single
+    # pass; the previous step's list, kept by the graph, is never mutated.
+    meta_raw = list(chain(state.get("meta_raw_battles", []), *new_batches))
 
     notes.append(
         "fetch_meta_battles: fetched "
@@ -347,10 +500,8 @@ def fetch_meta_battles_node(state: MetaState) -> Dict[str, Any]:
         f"total_meta_battles={len(meta_raw)}"
     )
 
-    # normalized_battles mirrors meta_raw_battles for now
     return {
         "meta_raw_battles": meta_raw,
-        "normalized_battles": meta_raw,
         "fetched_player_tags": fetched_tags,
         "notes": notes,
     }
@@ -358,19 +509,33 @@ def fetch_meta_battles_node(state: MetaState) -> Dict[str, Any]:
 
 def compute_meta_analytics_node(state: MetaState) -> Dict[str, Any]:
     """
-    Run the meta analytics engine on all normalized battles.
+    Update the meta analytics with the battles added since the last loop.
+
+    Only new battles are classified and counted; the (full) matchup matrix is
+    built once after the loop, in standardize_meta_table_node.
     """
     battles = state.get("meta_raw_battles", [])
-    analytics = compute_meta_analytics(battles)
+    start = state.get("last_analyzed_idx", 0)
+    prev_counts = state.get("meta_counts") or None
 
-    notes = list(state.get("notes", []))
+    # meta_raw_battles only grows; anything else means start over
+    if prev_counts is None or start > len(battles):
+        start, prev_counts = 0, None
+
+    counts = accumulate_meta_counts(battles[start:], prev_counts)
+    analytics = meta_analytics_from_counts(counts, include_matchups=False)
+
+    notes: List[str] = []
     notes.append(
         f"compute_meta_analytics: games_total={analytics.get('games_total', len(battles))}, "
-        f"deck_types_opp={len(analytics.get('opp_deck_types', []))}"
+        f"deck_types_opp={len(analytics.get('opp_deck_types', []))}, "
+        f"new_battles={len(battles) - start}"
     )
 
     return {
         "meta_analytics": analytics,
+        "meta_counts": counts,
+        "last_analyzed_idx": len(battles),
         "notes": notes,
     }
 
@@ -389,7 +554,7 @@ def check_enough_battles_node(state: MetaState) -> Dict[str, Any]:
         - is_balanced: bool
         - stop_decision: "enough" | "need_more" | "stop"
     """
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
     meta = state.get("meta_analytics", {}) or {}
 
     # Use summary.games_played if present, otherwise fall back to raw battle length
@@ -402,17 +567,11 @@ def check_enough_battles_node(state: MetaState) -> Dict[str, Any]:
     my_counts_raw = meta.get("deck_type_counts_my", {}) or {}
     opp_counts_raw = meta.get("deck_type_counts_opp", {}) or {}
 
-    combined_counts_raw: Dict[str, int] = {}
-    all_keys = set(my_counts_raw.keys()) | set(opp_counts_raw.keys())
-    for k in all_keys:
-        combined_counts_raw[k] = int(my_counts_raw.get(k, 0)) + int(
-            opp_counts_raw.get(k, 0)
-        )
-
-    # Normalize deck-type keys to lowercase for robustness
-    deck_counts_lower: Dict[str, int] = {
-        str(k).lower(): int(v) for k, v in combined_counts_raw.items()
-    }
+    # Normalize deck-type keys to lowercase for robustness, then merge
+    # (meta_analytics_from_counts already returns Dict[str, int])
+    deck_counts_lower: Counter = Counter(
+        {k.lower(): v for k, v in my_counts_raw.items()}
+    ) + Counter({k.lower(): v for k, v in opp_counts_raw.items()})
 
     # Check required deck types
     insufficient_types: Dict[str, int] = {}
@@ -471,21 +630,33 @@ def standardize_meta_table_node(state: MetaState) -> Dict[str, Any]:
     This does NOT run inside the loop; it only runs once when we decide the
     dataset is "enough" or when we stop due to loop/players limits.
     """
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
     battles = state.get("meta_raw_battles", []) or []
 
     if not battles:
         notes.append("standardize_meta_table: no battles in state, skipping.")
         return {"notes": notes}
 
-    meta_table = build_standardized_meta_table(battles)
+    # The loop already classified every battle into meta_counts["rows"];
+    # build the participant table from those instead of a second pass.
+    counts = state.get("meta_counts") or None
+    if counts is None or state.get("last_analyzed_idx", 0) != len(battles):
+        counts = accumulate_meta_counts(battles)
+
+    meta_table = meta_table_from_rows(battles, counts["rows"])
     notes.append(
         f"standardize_meta_table: built meta_table with {len(meta_table)} rows "
         f"from {len(battles)} battles."
     )
 
+    # The loop only kept running counts; build the full analytics (with the
+    # matchup matrix) once, now that the battle set is final.
+    analytics = dict(state.get("meta_analytics", {}) or {})
+    analytics.update(meta_analytics_from_counts(counts))
+
     return {
         "meta_table": meta_table,
+        "meta_analytics": analytics,
         "notes": notes,
     }
 
@@ -506,38 +677,34 @@ def _aggregate_meta_deck_type_stats(
           "win_rate": 23/42,
         }
     """
-    stats: Dict[str, Dict[str, Any]] = {}
-
-    for row in meta_table:
-        deck_type = row.get("deck_type", "Unknown")
-        result = row.get("result")
-
-        rec = stats.setdefault(
-            deck_type,
-            {
-                "type": deck_type,
-                "games": 0,
-                "wins": 0,
-                "losses": 0,
-                "draws": 0,
-                "win_rate": 0.0,
-            },
-        )
-
-        rec["games"] += 1
-        if result == "win":
-            rec["wins"] += 1
-        elif result == "loss":
-            rec["losses"] += 1
-        elif result == "draw":
-            rec["draws"] += 1
+    # Count on int-encoded columns instead of per-row dict updates
+    deck_types, counts = key_result_counts(
+        [row.get("deck_type", "Unknown") for row in meta_table],
+        [row.get("result") for row in meta_table],
+    )
 
-    for rec in stats.values():
-        games = rec["games"] or 0
-        rec["win_rate"] = rec["wins"] / games if games > 0 else 0.0
+    games = counts[:, 0]
+    win_rates = np.divide(
+        counts[:, 1], games, out=np.zeros(len(games)), where=games > 0
+    )
 
     # Sort by games descending so plots are stable and readable
-    return sorted(stats.values(), key=lambda r: r["games"], reverse=True)
+    # (stable: ties keep first-seen order)
+    order = np.argsort(-games, kind="stable")
+
+    return [
+        {
+            "type": deck_types[i],
+            "games": n_games,
+            "wins": wins,
+            "losses": losses,
+            "draws": draws,
+            "win_rate": win_rate,
+        }
+        for i, (n_games, wins, losses, draws), win_rate in zip(
+            order.tolist(), counts[order].tolist(), win_rates[order].tolist()
+        )
+    ]
 
 def build_meta_llm_tables_node(state: MetaState) -> Dict[str, Any]:
     """
@@ -553,7 +720,7 @@ def build_meta_llm_tables_node(state: MetaState) -> Dict[str, Any]:
             "meta_matchup_summary": [...],
         }
     """
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
     meta_table = state.get("meta_table", []) or []
     analytics = state.get("meta_analytics", {}) or {}
     matchups = analytics.get("deck_type_matchups", {}) or {}
@@ -609,7 +776,7 @@ def generate_meta_plots_node(state: MetaState) -> Dict[str, Any]:
             },
         }
     """
-    notes = list(state.get("notes", []))
+    notes: List[str] = []
 
     analytics = dict(state.get("meta_analytics", {}) or {})
     plots = dict(analytics.get("plots", {}) or {})
@@ -618,35 +785,57 @@ def generate_meta_plots_node(state: MetaState) -> Dict[str, Any]:
     deck_summary = llm_tables.get("meta_deck_summary", []) or []
     matchup_summary = llm_tables.get("meta_matchup_summary", []) or []
 
-    # --- 1) Overall meta deck-type plots (pie + win-rate bar) ---
+    # All charts are independent: render them on one shared thread pool
+    with ThreadPoolExecutor(max_workers=PLOT_MAX_WORKERS) as executor:
+
+        # --- 1) Overall meta deck-type plots (pie + win-rate bar) ---
+
+        pie_future = bar_future = None
+        if deck_summary:
+            # plots.plot_deck_type_* expects "type" instead of "deck_type";
+            # build_meta_deck_summary rows are already int/float typed
+            deck_types_for_plots: List[Dict[str, Any]] = [
+                {
+                    "type": row["deck_type"],
+                    "games": row["games"],
+                    "wins": row["wins"],
+                    "losses": row["losses"],
+                    "draws": row["draws"],
+                    "win_rate": row["win_rate"],
+                }
+                for row in deck_summary
+            ]
+
+            pie_future = executor.submit(
+                plot_deck_type_pie,
+                deck_types_for_plots,
+                title="Meta Deck Types (by Games Played)",
+                filename="meta_deck_types",
+            )
 
-    if deck_summary:
-        # plots.plot_deck_type_* expects "type" instead of "deck_type"
-        deck_types_for_plots: List[Dict[str, Any]] = [
-            {
-                "type": row.get("deck_type", "Unknown"),
-                "games": int(row.get("games", 0)),
-                "wins": int(row.get("wins", 0)),
-                "losses": int(row.get("losses", 0)),
-                "draws": int(row.get("draws", 0)),
-                "win_rate": float(row.get("win_rate", 0.0)),
-            }
-            for row in deck_summary
-        ]
-
-        plots["meta_deck_types_pie"] = plot_deck_type_pie(
-            deck_types_for_plots,
-            title="Meta Deck Types (by Games Played)",
-            filename="meta_deck_types",
-        )
+            bar_future = executor.submit(
+                plot_deck_type_bar,
+                deck_types_for_plots,
+                title="Meta Deck Types Win Rate (All Participants)",
+                filename="meta_deck_types_winrate",
+                metric="win_rate",
+            )
 
-        plots["meta_deck_types_winrate_bar"] = plot_deck_type_bar(
-            deck_types_for_plots,
-            title="Meta Deck Types Win Rate (All Participants)",
-            filename="meta_deck_types_winrate",
-            metric="win_rate",
-        )
+        # --- 2) Per-deck matchup graphs: each deck vs other types (W/R) ---
 
+        per_deck_paths = None
+        if matchup_summary:
+            per_deck_paths = _plot_meta_matchups_by_deck(
+                matchup_summary,
+                filename_prefix="meta_matchups",
+                executor=executor,
+            )
+
+        if pie_future is not None:
+            plots["meta_deck_types_pie"] = pie_future.result()
+            plots["meta_deck_types_winrate_bar"] = bar_future.result()
+
+    if deck_summary:
         notes.append(
             f"generate_meta_plots: created meta_deck_types_pie and "
             f"meta_deck_types_winrate_bar for {len(deck_types_for_plots)} deck types."
@@ -657,13 +846,7 @@ def generate_meta_plots_node(state: MetaState) -> Dict[str, Any]:
             "skipping deck-type pie/bar plots."
         )
 
-    # --- 2) Per-deck matchup graphs: each deck vs other types (W/R) ---
-
-    if matchup_summary:
-        per_deck_paths = _plot_meta_matchups_by_deck(
-            matchup_summary,
-            filename_prefix="meta_matchups",
-        )
+    if per_deck_paths is not None:
         plots["meta_matchups_by_deck"] = per_deck_paths
 
         notes.append(
@@ -1,5 +1,10 @@
 # src/workflows/phase2_constants.py
 # Constants + Enums for Phase 2 (Q&A Routing)
+import re
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, Tuple
+
+from src.analytics.deck_type import ALL_ARCHETYPES
 
 # --------------------------------------------
 # MODEL CHOICES FOR PHASE 2
@@ -14,18 +19,19 @@ EXPERT_MODEL = "gpt-4.1-mini"
 # --------------------------------------------
 # ALLOWED QUESTION CATEGORIES
 # --------------------------------------------
-CATEGORIES = [
+# Frozensets: only used for membership checks, and can't be mutated
+CATEGORIES: FrozenSet[str] = frozenset({
     "user",       # questions about user's own performance / playstyle
     "matchup",    # losing to certain decks, counters, WR vs X
     "meta",       # global meta questions
     "card",       # card usage, best cards, cards user loses to
     "other",      # unclear / fallback
-]
+})
 
 # --------------------------------------------
 # ATOMIC DATA BLOCKS (Phase 2 DataNeeds)
 # --------------------------------------------
-DATANEEDS = [
+DATANEEDS: FrozenSet[str] = frozenset({
     "USER_SUMMARY",          # user overall stats
     "USER_DECK_SUMMARY",     # decks user plays + winrates
     "USER_MATCHUP_SUMMARY",  # user's WR vs deck types
@@ -37,71 +43,78 @@ DATANEEDS = [
     "META_DECK_MATCHUPS",    # meta-level deck-vs-deck performance
 
     "SEND_ALL",              # fallback
-]
+})
 
 # --------------------------------------------
 # DEFAULT DATA NEEDS for each category
 # (used ONLY if LLM output is empty or invalid)
+# Read-only mapping of tuples; callers copy to a list if they need one.
 # --------------------------------------------
-DEFAULT_NEEDS = {
-    "user": ["USER_SUMMARY", "USER_DECK_SUMMARY"],
-    "matchup": ["USER_MATCHUP_SUMMARY"],
-    "meta": ["META_DECK_SUMMARY"],
-    "card": ["USER_CARD_SUMMARY"],
-    "other": ["SEND_ALL"],
-}
+DEFAULT_NEEDS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "user": ("USER_SUMMARY", "USER_DECK_SUMMARY"),
+    "matchup": ("USER_MATCHUP_SUMMARY",),
+    "meta": ("META_DECK_SUMMARY",),
+    "card": ("USER_CARD_SUMMARY",),
+    "other": ("SEND_ALL",),
+})
 
 # --------------------------------------------
 # CLASSIFIER SYSTEM PROMPT
 #Goal: only get need data to save token
 # --------------------------------------------
 CLASSIFIER_SYSTEM_PROMPT = """
-You are a routing classifier for a Clash Royale analytics assistant.
-
-Your job:
-1. Classify the user's question into ONE category.
-2. Choose ONLY the minimal data blocks ("data_needs") required to answer it.
-
-Allowed categories:
-- "user"      → performance or decks the user plays.
-- "matchup"   → losing to certain deck types, counters, deck-vs-deck questions.
-- "meta"      → global meta, popular decks, strongest archetypes.
-- "card"      → user's good/bad cards, or cards they lose to.
-- "other"     → anything unrelated or unclear.
-
-Allowed data_needs (Atomic building blocks):
-- "USER_SUMMARY"
-- "USER_DECK_SUMMARY"
-- "USER_MATCHUP_SUMMARY"
-- "USER_CARD_SUMMARY"
-- "OPPONENT_CARD_SUMMARY"
-- "META_DECK_SUMMARY"
-- "META_DECK_MATCHUPS"
-- "SEND_ALL"
-
-Short meanings:
-- USER_SUMMARY: overall user performance metrics
-- USER_DECK_SUMMARY: user's deck types + winrates
-- USER_MATCHUP_SUMMARY: user's performance vs deck types
-- USER_CARD_SUMMARY: user performance with cards
-- OPPONENT_CARD_SUMMARY: cards the user struggles against
-- META_DECK_SUMMARY: meta deck types + their winrates
-- META_DECK_MATCHUPS: how meta decks perform vs each other
-- SEND_ALL: fallback
-
-Rules:
-- You may choose MULTIPLE data blocks.
-- Always choose the MINIMAL blocks needed.
-- If the question asks:
-    - "Why do I lose to X?" → include USER_MATCHUP_SUMMARY
-    - "What counters X in meta?" → include META_DECK_MATCHUPS
-    - "What cards am I losing to?" → include OPPONENT_CARD_SUMMARY
-    - "What are my best cards?" → include USER_CARD_SUMMARY
-    - "How am I doing?" → include USER_SUMMARY
-    - "What deck do I win with?" → include USER_DECK_SUMMARY
-    - "What's strong in meta?" → include META_DECK_SUMMARY
-- If unclear → category="other", data_needs=["SEND_ALL"]
+Route a Clash Royale analytics question: pick ONE category and the MINIMAL data_needs (several allowed).
+
+Categories (default data_needs):
+user: user's own performance / decks played (USER_SUMMARY, USER_DECK_SUMMARY)
+matchup: losing to deck types, counters, deck-vs-deck (USER_MATCHUP_SUMMARY)
+meta: global meta, popular / strongest archetypes (META_DECK_SUMMARY)
+card: user's good/bad cards, cards they lose to (USER_CARD_SUMMARY)
+other: unrelated or unclear (SEND_ALL)
+
+data_needs:
+USER_SUMMARY=overall user stats; USER_DECK_SUMMARY=user deck types+WR;
+USER_MATCHUP_SUMMARY=user WR vs deck types; USER_CARD_SUMMARY=user card stats;
+OPPONENT_CARD_SUMMARY=cards user struggles vs; META_DECK_SUMMARY=meta deck types+WR;
+META_DECK_MATCHUPS=meta deck-vs-deck WR; SEND_ALL=fallback
+
+Examples: "Why do I lose to X?"->USER_MATCHUP_SUMMARY; "What counters X in meta?"->META_DECK_MATCHUPS;
+"What cards am I losing to?"->OPPONENT_CARD_SUMMARY; "My best cards?"->USER_CARD_SUMMARY;
+"How am I doing?"->USER_SUMMARY; "What deck do I win with?"->USER_DECK_SUMMARY;
+"What's strong in meta?"->META_DECK_SUMMARY; unclear->other, ["SEND_ALL"]
 
 Return ONLY valid JSON:
 {"category": "...", "data_needs": ["...", "..."]}
-"""
\ No newline at end of file
+"""
+
+# --------------------------------------------
+# FAST ROUTES (no LLM)
+# Unambiguous phrasings -> (category, data_needs). Patterns are anchored to
+# the end of the question, so anything more specific (a trailing "vs X" /
+# "against X" / "with X", a card or deck name) falls through to the LLM.
+# All patterns are joined into one alternation (FAST_ROUTE_PATTERN) so a
+# question is scanned once; the named group that matched says which route
+# fired.
+# --------------------------------------------
+_END = r"\s*[?.!]*\s*$"
+
+# "bait", "bridge spam", ... (deck-type names the matchup table is keyed on)
+_ARCHETYPES = "|".join(re.escape(a.lower()) for a in ALL_ARCHETYPES)
+
+FAST_ROUTES: List[Tuple[re.Pattern, str, List[str]]] = [
+    (re.compile(rf"\bmy (?:best|strongest|good|worst|weakest|bad) cards?{_END}", re.I),
+     "card", ["USER_CARD_SUMMARY"]),
+    (re.compile(rf"\bcards? (?:am i|do i) (?:los(?:e|ing)|struggl(?:e|ing)) (?:to|against|with){_END}", re.I),
+     "card", ["OPPONENT_CARD_SUMMARY"]),
+    (re.compile(rf"\b(?:los(?:e|ing)|struggl(?:e|ing)) (?:to|against|with|vs\.?) (?:{_ARCHETYPES})(?: decks?)?{_END}", re.I),
+     "matchup", ["USER_MATCHUP_SUMMARY"]),
+    (re.compile(rf"^\s*what(?:'s| is| are) (?:the )?(?:strongest|best|strong|good|most popular|popular)(?: decks?| archetypes?)? (?:in|right now in) (?:the )?meta(?: right now)?{_END}", re.I),
+     "meta", ["META_DECK_SUMMARY"]),
+    (re.compile(rf"^\s*(?:how am i doing(?: overall| lately| so far)?|what(?:'s| is| are) my (?:overall )?(?:stats|win ?rate)){_END}", re.I),
+     "user", ["USER_SUMMARY"]),
+]
+
+FAST_ROUTE_PATTERN = re.compile(
+    "|".join(f"(?P<g{i}>{p.pattern})" for i, (p, _, _) in enumerate(FAST_ROUTES)),
+    re.I,
+)
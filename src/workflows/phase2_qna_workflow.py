@@ -1,12 +1,19 @@
 # src/workflows/phase2_qna_workflow.py
 import json
-from typing import TypedDict, Dict, Any, List
+from functools import lru_cache
+from typing import TypedDict, Dict, Any, List, Optional, Tuple
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import interrupt
 from openai import OpenAI
 from src.api.llm_client import chat_completion 
 
+try:
+    import orjson  # optional: faster (and more compact) prompt JSON
+except ImportError:
+    orjson = None
+
 from src.workflows.phase2_constants import CATEGORIES, DATANEEDS, DEFAULT_NEEDS, CLASSIFIER_SYSTEM_PROMPT, CLASSIFIER_MODEL, EXPERT_MODEL
+from src.workflows.phase2_constants import FAST_ROUTES, FAST_ROUTE_PATTERN
 
 from src.workflows.meta_workflow import build_meta_graph
 from src.workflows.user_workflow import build_user_analytics_graph
@@ -44,6 +51,20 @@ class QnAState(TypedDict, total=False):
 
 
 #---------------Helper---------------------
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON for prompts; numpy scalars/arrays and odd keys are handled."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
 def build_classifier_user_prompt(question: str) -> str:
     return f"""
 Classify the following question. Respond in JSON only.
@@ -56,7 +77,7 @@ def prep_user_context_node(state):
     data_needs = state.get("question_data_needs", [])
 
     user_llm = state.get("user_llm_tables", {})
-    summary_table = user_llm.get("user_summary", [])
+    summary_table = user_llm.get("user_summary", {})
     deck_table = user_llm.get("user_deck_summary", [])
 
     context_tables = {}
@@ -67,8 +88,8 @@ def prep_user_context_node(state):
         context_tables["user_summary"] = summary_table
 
         # Convert summary into readable lines
-        for row in summary_table:
-            summary_lines.append(f"{row['metric']}: {row['value']}")
+        for metric, value in summary_table.items():
+            summary_lines.append(f"{metric}: {value}")
 
     # Include USER_DECK_SUMMARY
     if "USER_DECK_SUMMARY" in data_needs:
@@ -105,7 +126,7 @@ def prep_matchup_context_node(state: QnAState) -> QnAState:
     user_llm = state.get("user_llm_tables", {}) or {}
     meta_llm = state.get("meta_llm_tables", {}) or {}
 
-    user_summary = user_llm.get("user_summary", [])
+    user_summary = user_llm.get("user_summary", {})
     user_matchups = user_llm.get("user_matchup_summary", [])
     meta_decks = meta_llm.get("meta_deck_summary", [])
     meta_matchups = meta_llm.get("meta_matchup_summary", [])
@@ -210,7 +231,7 @@ def prep_other_context_node(state):
     notes = state.setdefault("notes", [])
 
     # Just provide everything we can
-    summary = state.get("user_llm_tables", {}).get("user_summary", [])
+    summary = state.get("user_llm_tables", {}).get("user_summary", {})
 
     context_tables = {"user_summary": summary}
 
@@ -220,30 +241,69 @@ def prep_other_context_node(state):
     return state
 
 
-#----------------nodes----------------------------
-def classify_question_node(state):
-    question = state.get("question", "")
-    notes = state.setdefault("notes", [])
+def _clean_classification(
+    category: Any, needs: Any, notes: List[str]
+) -> Tuple[str, List[str]]:
+    """Validate one classifier result; unknown values fall back to defaults."""
+    # isinstance first: frozenset membership raises on unhashable JSON values
+    if not isinstance(category, str) or category not in CATEGORIES:
+        notes.append(f"classify_question: invalid category '{category}' → fallback")
+        category = "other"
+        needs = ["SEND_ALL"]
 
-    user_prompt = build_classifier_user_prompt(question)
+    # Validate / filter data_needs
+    cleaned = [n for n in (needs or []) if isinstance(n, str) and n in DATANEEDS]
+    if not cleaned:
+        cleaned = list(DEFAULT_NEEDS[category])
+    return category, cleaned
 
-    # Call cheap classifier model through api.llm_client
-    try:
-        raw = chat_completion(
-            model=CLASSIFIER_MODEL,
-            system_prompt=CLASSIFIER_SYSTEM_PROMPT,
-            user_prompt=user_prompt,
-            max_tokens=300,
-        )
-    except Exception as e:
-        notes.append(f"classify_question: LLM error → fallback ({e})")
-        state["question_category"] = "other"
-        state["question_data_needs"] = ["SEND_ALL"]
-        return state
+
+def fast_classify(question: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Keyword fast path: (category, data_needs) when the question matches
+    exactly one FAST_ROUTES category, else None (let the LLM decide).
+    """
+    hits = {int(m.lastgroup[1:]) for m in FAST_ROUTE_PATTERN.finditer(question or "")}
+    if not hits:
+        return None
+
+    routes = [FAST_ROUTES[i] for i in sorted(hits)]
+    if len({category for _, category, _ in routes}) != 1:
+        # Mixed cues across categories: ambiguous
+        return None
+
+    needs: List[str] = []
+    for _, _, route_needs in routes:
+        needs.extend(n for n in route_needs if n not in needs)
+    return routes[0][1], needs
+
+
+def _normalize_question(question: str) -> str:
+    """Case/whitespace-insensitive form, so trivial rephrasings share a cache entry."""
+    return " ".join((question or "").lower().split())
+
+
+@lru_cache(maxsize=4096)
+def _classify_normalized(question: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    LLM classification of an already-normalized question, memoized in-process.
+    Returns (category, data_needs, notes); LLM errors propagate (not cached).
+
+    Across processes, chat_completion's prompt-hash disk cache (keyed on the
+    model and CLASSIFIER_SYSTEM_PROMPT too, so prompt edits bust it) also
+    hits, since the normalized text is what gets sent.
+    """
+    notes: List[str] = []
+    raw = chat_completion(
+        model=CLASSIFIER_MODEL,
+        system_prompt=CLASSIFIER_SYSTEM_PROMPT,
+        user_prompt=build_classifier_user_prompt(question),
+        max_tokens=300,
+    )
 
     # Parse JSON
     try:
-        parsed = json.loads(raw)
+        parsed = _json_loads(raw)
         category = parsed.get("category")
         needs = parsed.get("data_needs", [])
     except Exception:
@@ -251,15 +311,34 @@ def classify_question_node(state):
         category = "other"
         needs = ["SEND_ALL"]
 
-    if category not in CATEGORIES:
-        notes.append(f"classify_question: invalid category '{category}' → fallback")
-        category = "other"
-        needs = ["SEND_ALL"]
+    category, cleaned = _clean_classification(category, needs, notes)
+    return category, tuple(cleaned), tuple(notes)
 
-    # Validate / filter data_needs
-    cleaned = [n for n in needs if n in DATANEEDS]
-    if not cleaned:
-        cleaned = DEFAULT_NEEDS[category]
+
+def classify_question(question: str, notes: List[str]) -> Tuple[str, List[str]]:
+    """Classify a single question -> (category, data_needs)."""
+    fast = fast_classify(question)
+    if fast is not None:
+        notes.append("classify_question: keyword fast path")
+        return fast
+
+    # Call cheap classifier model through api.llm_client (memoized)
+    try:
+        category, needs, parse_notes = _classify_normalized(_normalize_question(question))
+    except Exception as e:
+        notes.append(f"classify_question: LLM error → fallback ({e})")
+        return "other", ["SEND_ALL"]
+
+    notes.extend(parse_notes)
+    return category, list(needs)
+
+
+#----------------nodes----------------------------
+def classify_question_node(state):
+    question = state.get("question", "")
+    notes = state.setdefault("notes", [])
+
+    category, cleaned = classify_question(question, notes)
 
     state["question_category"] = category
     state["question_data_needs"] = cleaned
@@ -390,7 +469,7 @@ def expert_answer_llm_node(state: QnAState) -> QnAState:
 
     # Convert tables to JSON (truncated for safety)
     try:
-        tables_json = json.dumps(context_tables, default=str)
+        tables_json = _json_dumps(context_tables)
     except Exception:
         tables_json = "{}"
 
@@ -420,6 +499,8 @@ Context tables (JSON):
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             max_tokens=700,
+            # Never cached: the answer depends on the user's current data
+            use_cache=False,
         )
         notes.append("expert_answer_llm: answered successfully")
     except Exception as e:
@@ -593,27 +674,6 @@ def ensure_user(state: CoachState) -> CoachState:
         "player_tag": user_state.get("player_tag", player_tag),
     }
 
-def ask_for_question(state: CoachState) -> CoachState:
-    question = interrupt("What would you like to ask about your Clash performance?"
-                         "(Type 'stop' to finish.)")
-    return {**state, "question": question}
-
-def ensure_user(state: CoachState) -> CoachState:
-    # If we've already built user analytics for this tag, reuse them
-    if "user_analytics" in state and "user_llm_tables" in state:
-        return state
-
-    player_tag = state["player_tag"]
-    user_state = _user_graph.invoke({"player_tag": player_tag})
-
-    return {
-        **state,
-        "user_analytics": user_state.get("user_analytics", {}),
-        "user_llm_tables": user_state.get("user_llm_tables", {}),
-        # (optional) keep tag in sync
-        "player_tag": user_state.get("player_tag", player_tag),
-    }
-
 def ask_for_question(state: CoachState) -> CoachState:
     question = interrupt("What would you like to ask about your Clash performance?")
     return {**state, "question": question}
@@ -1,13 +1,13 @@
 # src/workflows/user_workflow.py
-from typing import Any, Dict, List
-from typing_extensions import TypedDict
+import operator
+from typing import Any, Dict, Iterable, Iterator, List
+from typing_extensions import Annotated, TypedDict
 
 from langgraph.graph import StateGraph, END
 
-from src.api.battles import get_player_battlelog
+from src.api.battles import iter_player_battlelog
 from src.analytics.battle_filters import filter_and_normalize_ranked_1v1
-from src.analytics.user_analytics import compute_user_analytics
-from src.analytics.plots import generate_card_plots
+from src.analytics.user_analytics import CARD_TOP_N, compute_user_analytics
 
 # ---------- LangGraph State Definition ----------
 
@@ -19,28 +19,30 @@ class UserAnalyticsState(TypedDict, total=False):
     Fields:
 
       - player_tag: input from user (e.g. "#8C8JJQLG")
-      - battles_raw: raw battlelog list from Clash Royale API
       - battles_filtered: ranked/Trophy Road 1v1 battles (normalized)
       - user_analytics: analytics dict (same schema as meta_analytics)
       - user_plots: optional dict of plot paths (usually analytics["plots"])
-      - notes: optional list of debug / info strings
+      - notes: optional list of debug / info strings; nodes return only their
+        new notes and the reducer appends them (needed for parallel branches)
     """
 
     player_tag: str
-    battles_raw: List[Dict[str, Any]]
     battles_filtered: List[Dict[str, Any]]
     user_analytics: Dict[str, Any]
     user_llm_tables: Dict[str, Any]
     user_plots: Dict[str, Any]
-    notes: List[str]
+    notes: Annotated[List[str], operator.add]
     
 # ---------- LLM helper table builders ----------
+# Inputs are compute_user_analytics output, whose table values are lists of
+# dicts by construction, so rows are not type-checked one by one.
 
-def build_user_summary_table(summary: dict):
-    table = []
-    for key, value in (summary or {}).items():
-        table.append({"metric": key, "value": value})
-    return table
+def build_user_summary_table_flat(summary: dict):
+    """
+    {metric: value} as-is (copied): serializes to fewer prompt tokens than
+    a list of {metric, value} rows.
+    """
+    return dict(summary or {})
 
 
 def build_user_deck_summary(user_analytics):
@@ -56,9 +58,6 @@ def build_user_deck_summary(user_analytics):
         return table
 
     for row in raw:
-        if not isinstance(row, dict):
-            continue
-
         deck_type = (
             row.get("deck_type")
             or row.get("type")        
@@ -67,9 +66,8 @@ def build_user_deck_summary(user_analytics):
         if not deck_type:
             continue
 
-        new_row = dict(row)  # shallow copy
-        new_row["deck_type"] = deck_type
-        table.append(new_row)
+        # shallow copy + overlay in a single dict merge
+        table.append({**row, "deck_type": deck_type})
 
     return table
 
@@ -99,194 +97,115 @@ def build_user_matchup_summary(user_analytics):
     if not isinstance(raw, list):
         return []
 
-    table: List[dict] = []
+    # shallow copies of the well-formed rows; no difficulty labels
+    return [
+        dict(row)
+        for row in raw
+        if row.get("my_deck_type")
+        and row.get("opp_deck_type")
+    ]
 
-    for row in raw:
-        if not isinstance(row, dict):
-            continue
-
-        my_type = row.get("my_deck_type")
-        opp_type = row.get("opp_deck_type")
-        if not my_type or not opp_type:
-            continue
 
-        # shallow copy; no difficulty labels
-        out_row = dict(row)
-        table.append(out_row)
-
-    return table
-
-
-def build_user_card_summary(user_analytics):
+def _merge_card_lists(user_analytics, lists):
     """
-    Merge best_cards + worst_cards into one per-card summary.
+    Merge ranked card lists into one row per card.
 
-    We keep the original stats and add:
+    `lists` is ((role, analytics key), ...). Rows come from
+    compute_card_performance (card under "card"); every card on any list is
+    kept. Each row keeps the card's stats and adds:
       - card_name (alias of card)
-      - role: "best" / "worst"
-      - source: "best_cards" / "worst_cards"
-    """
-    table: List[dict] = []
-
-    best_cards = user_analytics.get("best_cards") or []
-    worst_cards = user_analytics.get("worst_cards") or []
-
-    # Best cards
-    for row in best_cards:
-        if not isinstance(row, dict):
-            continue
-        card_name = row.get("card") or row.get("card_name")
-        if not card_name:
-            continue
-
-        new_row = dict(row)
-        new_row["card_name"] = card_name
-        new_row["role"] = "best"
-        new_row["source"] = "best_cards"
-        table.append(new_row)
-
-    # Worst cards
-    for row in worst_cards:
-        if not isinstance(row, dict):
-            continue
-        card_name = row.get("card") or row.get("card_name")
-        if not card_name:
-            continue
-
-        new_row = dict(row)
-        new_row["card_name"] = card_name
-        new_row["role"] = "worst"
-        new_row["source"] = "worst_cards"
-        table.append(new_row)
+      - ranks: {role: 1-based position in that list}
+      - roles: the roles where the card is in the top CARD_TOP_N
 
-    return table
-
-def build_opponent_card_summary(user_analytics):
+    best/worst (and tough/easy) are the same cards in opposite order, so a
+    card only gets both roles when fewer than 2 * CARD_TOP_N cards qualify.
     """
-    Merge tough_opp_cards + easy_opp_cards into one per-opponent-card summary.
-    We keep the stats and add:
-      - card_name (alias of card)
-      - role: "tough" / "easy"
-      - source: "tough_opp_cards" / "easy_opp_cards"
-    """
-    table: List[dict] = []
+    merged: Dict[str, dict] = {}
+
+    for role, key in lists:
+        for rank, row in enumerate(user_analytics.get(key) or [], start=1):
+            card_name = row.get("card")
+            if not card_name:
+                continue
+
+            entry = merged.get(card_name)
+            if entry is None:
+                # One row per unique card, built from its first occurrence
+                entry = merged[card_name] = {
+                    **row,
+                    "card_name": card_name,
+                    "roles": [],
+                    "ranks": {},
+                }
+            entry["ranks"][role] = rank
+            if rank <= CARD_TOP_N:
+                entry["roles"].append(role)
+
+    return list(merged.values())
 
-    tough_opp = user_analytics.get("tough_opp_cards") or []
-    easy_opp = user_analytics.get("easy_opp_cards") or []
 
-    # Cards you struggle against
-    for row in tough_opp:
-        if not isinstance(row, dict):
-            continue
-        card_name = row.get("card") or row.get("card_name")
-        if not card_name:
-            continue
-
-        new_row = dict(row)
-        new_row["card_name"] = card_name
-        new_row["role"] = "tough"
-        new_row["source"] = "tough_opp_cards"
-        table.append(new_row)
-
-    # Cards you handle well
-    for row in easy_opp:
-        if not isinstance(row, dict):
-            continue
-        card_name = row.get("card") or row.get("card_name")
-        if not card_name:
-            continue
+def build_user_card_summary(user_analytics):
+    """best_cards + worst_cards, one row per card (roles "best" / "worst")."""
+    return _merge_card_lists(
+        user_analytics, (("best", "best_cards"), ("worst", "worst_cards"))
+    )
 
-        new_row = dict(row)
-        new_row["card_name"] = card_name
-        new_row["role"] = "easy"
-        new_row["source"] = "easy_opp_cards"
-        table.append(new_row)
 
-    return table
+def build_opponent_card_summary(user_analytics):
+    """tough_opp_cards + easy_opp_cards, one row per card (roles "tough" / "easy")."""
+    return _merge_card_lists(
+        user_analytics, (("tough", "tough_opp_cards"), ("easy", "easy_opp_cards"))
+    )
 
 
 
-# ---------- Node: fetch_battlelog ----------
+# ---------- Node: process_battles ----------
 
 
-def fetch_battlelog_node(state: UserAnalyticsState) -> Dict[str, Any]:
+def process_battles_node(state: UserAnalyticsState) -> Dict[str, Any]:
     """
-    Node:
+    Node (fetch -> filter/normalize -> analytics, fused):
       - reads player_tag from state
-      - calls Clash Royale API
-      - writes battles_raw into state
+      - streams the player's battlelog from the Clash Royale API
+      - filters to ranked/Trophy Road 1v1 and normalizes each battle as it
+        arrives (the raw battlelog is never collected into state)
+      - computes analytics dict
+      - writes battles_filtered and user_analytics into state
     """
     player_tag = state.get("player_tag")
     if not player_tag:
-        raise ValueError("player_tag is required in state for fetch_battlelog_node")
-
-    raw_battles = get_player_battlelog(player_tag)
-
-    note = f"Fetched {len(raw_battles)} battles for {player_tag}"
-    existing_notes = state.get("notes", []) or []
-    existing_notes.append(note)
-
-    return {
-        "battles_raw": raw_battles,
-        "notes": existing_notes,
-    }
-
-
-# ---------- Node: filter_and_normalize ----------
-
-
-def filter_and_normalize_node(state: UserAnalyticsState) -> Dict[str, Any]:
-    """
-    Node:
-      - reads battles_raw
-      - filters to ranked/Trophy Road 1v1
-      - normalizes battles
-      - writes battles_filtered into state
-    """
-    battles_raw = state.get("battles_raw", []) or []
-    if not battles_raw:
-        raise ValueError("battles_raw is required in state for filter_and_normalize_node")
+        raise ValueError("player_tag is required in state for process_battles_node")
 
-    battles_filtered = filter_and_normalize_ranked_1v1(battles_raw)
+    raw_count = 0
 
-    note = f"Filtered to {len(battles_filtered)} ranked/Trophy Road 1v1 battles"
-    existing_notes = state.get("notes", []) or []
-    existing_notes.append(note)
-
-    return {
-        "battles_filtered": battles_filtered,
-        "notes": existing_notes,
-    }
-
-
-# ---------- Node: compute_user_analytics ----------
+    def _counted(battles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal raw_count
+        for battle in battles:
+            raw_count += 1
+            yield battle
 
+    battles_filtered = filter_and_normalize_ranked_1v1(
+        _counted(iter_player_battlelog(player_tag))
+    )
 
-def compute_user_analytics_node(state: UserAnalyticsState) -> Dict[str, Any]:
-    """
-    Node:
-      - reads battles_filtered
-      - computes analytics dict
-      - writes user_analytics into state
-    """
-    battles_filtered = state.get("battles_filtered", []) or []
+    if not raw_count:
+        raise ValueError(f"No battles returned for {player_tag}")
     if not battles_filtered:
         raise ValueError(
-            "battles_filtered is required in state for compute_user_analytics_node"
+            f"No ranked/Trophy Road 1v1 battles in the battlelog for {player_tag}"
         )
 
     analytics = compute_user_analytics(battles_filtered)
 
-    note = (
-        f"Computed analytics on {analytics.get('summary', {}).get('games_played', 0)} "
-        "ranked/Trophy Road 1v1 battles"
-    )
-    existing_notes = state.get("notes", []) or []
-    existing_notes.append(note)
-
     return {
+        "battles_filtered": battles_filtered,
         "user_analytics": analytics,
-        "notes": existing_notes,
+        "notes": [
+            f"Fetched {raw_count} battles for {player_tag}",
+            f"Filtered to {len(battles_filtered)} ranked/Trophy Road 1v1 battles",
+            f"Computed analytics on {analytics.get('summary', {}).get('games_played', 0)} "
+            "ranked/Trophy Road 1v1 battles",
+        ],
     }
 
 
@@ -306,16 +225,18 @@ def generate_user_plots_node(state: UserAnalyticsState) -> Dict[str, Any]:
             "user_analytics is required in state for generate_user_plots_node"
         )
 
+    # Imported here so building the graph / LLM tables never loads matplotlib
+    # (~0.7s); after the first call this is just a sys.modules lookup.
+    from src.analytics.plots import generate_card_plots
+
     analytics_with_plots = generate_card_plots(analytics, prefix="user")
 
     note = "Generated user card-level plots"
-    existing_notes = state.get("notes", []) or []
-    existing_notes.append(note)
 
     return {
         "user_analytics": analytics_with_plots,
         "user_plots": analytics_with_plots.get("plots", {}),
-        "notes": existing_notes,
+        "notes": [note],
     }
 
 ## ---------- Node: llm tables ----------
@@ -328,7 +249,7 @@ def build_user_llm_tables_node(state: UserAnalyticsState) -> Dict[str, Any]:
       - writes user_llm_tables into state
 
     Layout for user_llm_tables:
-      - user_summary
+      - user_summary ({metric: value} dict)
       - user_deck_summary
       - user_matchup_summary
       - user_card_summary
@@ -341,15 +262,14 @@ def build_user_llm_tables_node(state: UserAnalyticsState) -> Dict[str, Any]:
         )
 
     user_llm_tables = {
-        "user_summary": build_user_summary_table(user_analytics.get("summary") or {}),
+        "user_summary": build_user_summary_table_flat(user_analytics.get("summary") or {}),
         "user_deck_summary": build_user_deck_summary(user_analytics),
         "user_matchup_summary": build_user_matchup_summary(user_analytics),
         "user_card_summary": build_user_card_summary(user_analytics),
         "opponent_card_summary": build_opponent_card_summary(user_analytics),
     }
 
-    existing_notes = state.get("notes", []) or []
-    existing_notes.append(
+    note = (
         "build_user_llm_tables: built "
         f"{len(user_llm_tables['user_deck_summary'])} deck rows, "
         f"{len(user_llm_tables['user_matchup_summary'])} matchup rows, "
@@ -359,7 +279,7 @@ def build_user_llm_tables_node(state: UserAnalyticsState) -> Dict[str, Any]:
 
     return {
         "user_llm_tables": user_llm_tables,
-        "notes": existing_notes,
+        "notes": [note],
     }
 
 
@@ -373,27 +293,26 @@ def build_user_analytics_graph():
 
     Pipeline (D4):
 
-        fetch_battlelog
-            -> filter_and_normalize
-            -> compute_user_analytics
-            -> generate_user_plots
-            -> END
+        process_battles  (fetch -> filter/normalize -> analytics, one pass)
+            -> build_user_llm_tables  \
+            -> generate_user_plots    /  (parallel branches) -> END
+
+    The two branches only read user_analytics and write disjoint keys
+    (plus notes, which has an append reducer), so LangGraph runs them in
+    the same step and plot rendering is off the table-building path.
     """
     graph = StateGraph(UserAnalyticsState)
 
     # Nodes
-    graph.add_node("fetch_battlelog", fetch_battlelog_node)
-    graph.add_node("filter_and_normalize", filter_and_normalize_node)
-    graph.add_node("compute_user_analytics", compute_user_analytics_node)
-    graph.add_node("build_user_llm_tables", build_user_llm_tables_node)  
+    graph.add_node("process_battles", process_battles_node)
+    graph.add_node("build_user_llm_tables", build_user_llm_tables_node)
     graph.add_node("generate_user_plots", generate_user_plots_node)
 
     # Entry / edges
-    graph.set_entry_point("fetch_battlelog")
-    graph.add_edge("fetch_battlelog", "filter_and_normalize")
-    graph.add_edge("filter_and_normalize", "compute_user_analytics")
-    graph.add_edge("compute_user_analytics", "build_user_llm_tables")  
-    graph.add_edge("build_user_llm_tables", "generate_user_plots")       
+    graph.set_entry_point("process_battles")
+    graph.add_edge("process_battles", "build_user_llm_tables")
+    graph.add_edge("process_battles", "generate_user_plots")
+    graph.add_edge("build_user_llm_tables", END)
     graph.add_edge("generate_user_plots", END)
 
 
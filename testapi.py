@@ -1,7 +1,26 @@
+import asyncio
+import functools
+import hashlib
+import json
+import logging
 import os
+import pathlib
+import sys
+import time
 from dotenv import load_dotenv
-import requests
-from langchain_openai import ChatOpenAI
+import httpx
+from openai import AsyncOpenAI, AuthenticationError
+
+try:
+    import h2  # noqa: F401  (optional: enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import simdjson  # optional: lazy parse, only touched fields become Python objects
+except ImportError:
+    simdjson = None
 
 #--------------------------------------------------------
 #Use this file to test if the .env is set-up correctly
@@ -16,70 +35,191 @@ CR_API_KEY = os.getenv("CR_API_KEY")
 PLAYER_TAG = os.getenv("PLAYER_TAG")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-print("Loaded keys:")
-print("  CR_API_KEY exists?", CR_API_KEY is not None)
-print("  PLAYER_TAG =", PLAYER_TAG)
-print("  OPENAI_API_KEY exists?", OPENAI_API_KEY is not None)
+# Built once at import; the tag's "#" is sent URL-encoded as %23
+BATTLELOG_URL = (
+    "https://api.clashroyale.com/v1/players/"
+    f"%23{(PLAYER_TAG or '').replace('#', '')}/battlelog"
+)
+
+# LOG_LEVEL=DEBUG also shows which keys were loaded
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
+log = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)  # no per-request lines
+
+log.debug("Loaded keys:")
+log.debug("  CR_API_KEY exists? %s", CR_API_KEY is not None)
+log.debug("  PLAYER_TAG = %s", PLAYER_TAG)
+log.debug("  OPENAI_API_KEY exists? %s", OPENAI_API_KEY is not None)
+
+# ---------------------------------------------------------
+# Shared async client (keep-alive pool, HTTP/2 when h2 is installed)
+# ---------------------------------------------------------
+CR_TIMEOUT = 10  # seconds
+
+
+def _make_client():
+    return httpx.AsyncClient(
+        http2=_HTTP2,
+        headers={"Authorization": f"Bearer {CR_API_KEY}"},
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        timeout=CR_TIMEOUT,
+    )
+
+# ---------------------------------------------------------
+# Opt-in on-disk response cache (CR_CACHE_TTL=<seconds>). Off by default:
+# a cached 200 would still say "key works" after the key was revoked.
+# ---------------------------------------------------------
+CACHE_DIR = pathlib.Path(".cache")
+CR_CACHE_TTL = int(os.getenv("CR_CACHE_TTL", "0"))  # seconds; 0 = off
+
+
+def _cache_path(method, url, auth):
+    # The API key is part of the key (hashed), so a new key always re-tests
+    auth_hash = hashlib.sha256(auth.encode()).hexdigest()
+    key = hashlib.md5((method + url + auth_hash).encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _cache_get(url, auth):
+    """Cached response body (bytes) if still fresh, else None."""
+    if CR_CACHE_TTL <= 0:
+        return None
+    try:
+        entry = json.loads(_cache_path("GET", url, auth).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("time", 0) > CR_CACHE_TTL:
+        return None
+    return entry["body"].encode("utf-8")
+
+
+def _cache_set(url, auth, body):
+    if CR_CACHE_TTL <= 0:
+        return
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        _cache_path("GET", url, auth).write_text(
+            json.dumps({"time": time.time(), "body": body.decode("utf-8")}),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass  # best-effort
 
 # ---------------------------------------------------------
 # Test Clash Royale API
 # ---------------------------------------------------------
-def test_clash_royale():
-    print("\nTesting Clash Royale API...")
+async def _fetch(client, url):
+    """(url, status, body bytes, cached?) for one GET; 200s go through the cache."""
+    body = _cache_get(url, CR_API_KEY)
+    if body is not None:
+        return url, 200, body, True
+
+    r = await client.get(url)
+    if r.status_code == 200:
+        _cache_set(url, CR_API_KEY, r.content)
+    return url, r.status_code, r.content, False
+
+
+async def test_clash_royale(client):
+    log.info("\nTesting Clash Royale API...")
 
     if not CR_API_KEY:
-        print("❌ CR_API_KEY missing in .env")
+        log.error("❌ CR_API_KEY missing in .env")
+        return
+
+    # Supercell keys are long JWTs ("eyJ..."); anything else (e.g. a
+    # "your_key_here" placeholder) would just come back as a 403.
+    if not CR_API_KEY.startswith("eyJ") or len(CR_API_KEY) < 200:
+        log.error("❌ CR_API_KEY looks invalid (expected a JWT from developer.clashroyale.com)")
         return
 
-    tag_no_hash = PLAYER_TAG.replace("#", "")
-    url = f"https://api.clashroyale.com/v1/players/%23{tag_no_hash}/battlelog"
+    if not PLAYER_TAG:
+        log.error("❌ PLAYER_TAG missing in .env")
+        return
 
-    headers = {
-        "Authorization": f"Bearer {CR_API_KEY}"
-    }
+    # Endpoints to probe; they are independent, so extra ones (player,
+    # clan, ...) run concurrently on the shared client.
+    urls = [BATTLELOG_URL]
 
     try:
-        r = requests.get(url, headers=headers)
-        print("Status Code:", r.status_code)
-
-        if r.status_code == 200:
-            data = r.json()
-            print("Battlelog length:", len(data))
-            print("Sample fields:", list(data[0].keys()))
-            print("✅ Clash Royale API key works!")
+        results = await asyncio.gather(*(_fetch(client, u) for u in urls))
+
+        for _, status, body, cached in results:
+            if cached:
+                log.info("Status Code: 200 (cached, CR_CACHE_TTL=%ss)", CR_CACHE_TTL)
+            else:
+                log.info("Status Code: %s", status)
+
+            if status != 200:
+                log.error("❌ Clash Royale API failed:\n%s", body.decode("utf-8", "replace"))
+                return
+
+        body = results[0][2]
+
+        # Same parse path for cached and fresh bytes
+        if simdjson is not None:
+            data = simdjson.Parser().parse(body)
+            log.info("Battlelog length: %s", len(data))
+            log.info("Sample fields: %s", list(data.at_pointer("/0").keys()))
         else:
-            print("❌ Clash Royale API failed:")
-            print(r.text)
+            data = json.loads(body)
+            log.info("Battlelog length: %s", len(data))
+            log.info("Sample fields: %s", list(data[0].keys()))
+        log.info("✅ Clash Royale API key works!")
 
     except Exception as e:
-        print("❌ Error talking to Clash Royale API:")
-        print(e)
+        log.error("❌ Error talking to Clash Royale API:\n%s", e)
 
 
 # ---------------------------------------------------------
-# Test OpenAI API (LangChain)
+# Test OpenAI API
 # ---------------------------------------------------------
-def test_openai():
-    print("\nTesting OpenAI API...")
+# --deep also runs a LangChain completion (the default is a cheap
+# models.list key check that doesn't import LangChain at all)
+DEEP = "--deep" in sys.argv[1:]
+
+
+@functools.lru_cache(maxsize=4)
+def _get_llm(model):
+    # Built once per model: repeat probes reuse the client and its connections
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=model)
+
+
+async def test_openai():
+    log.info("\nTesting OpenAI API...")
 
     if not OPENAI_API_KEY:
-        print("❌ OPENAI_API_KEY missing in .env")
+        log.error("❌ OPENAI_API_KEY missing in .env")
         return
 
     try:
-        llm = ChatOpenAI(model="gpt-4.1-mini")
-        resp = llm.invoke("Say 'keys working'")
-        print("OpenAI Response:", resp.content)
-        print("✅ OpenAI key works!")
+        if DEEP:
+            llm = _get_llm("gpt-4.1-mini")
+            resp = await llm.ainvoke("Say 'keys working'")
+            log.info("OpenAI Response: %s", resp.content)
+        else:
+            async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+                page = await client.models.list()
+            log.info("OpenAI models visible: %s", len(page.data))
+        log.info("✅ OpenAI key works!")
 
+    except AuthenticationError as e:
+        log.error("❌ OpenAI rejected OPENAI_API_KEY:\n%s", e)
     except Exception as e:
-        print("❌ Error talking to OpenAI:")
-        print(e)
+        log.error("❌ Error talking to OpenAI:\n%s", e)
 
 
 # ---------------------------------------------------------
 # Run tests
 # ---------------------------------------------------------
+async def main():
+    # The two probes are independent network round trips: run them
+    # concurrently so the total is max(CR, OpenAI) instead of the sum.
+    async with _make_client() as client:
+        await asyncio.gather(test_clash_royale(client), test_openai())
+
+
 if __name__ == "__main__":
-    test_clash_royale()
-    test_openai()
+    asyncio.run(main())
@@ -8,8 +8,23 @@ And fills in:
     card_metadata[i]["elixir"] = elixirCost from cards_raw.json
 """
 
+import hashlib
 import json
+import os
 import pathlib
+import tempfile
+
+try:
+    import orjson  # optional: faster load/save (same output bytes)
+except ImportError:
+    orjson = None
+
+try:
+    # optional: stream cards_raw.json. C backend only; the pure-Python
+    # backend is slower than a full orjson/json load.
+    from ijson.backends import yajl2_c as ijson
+except ImportError:
+    ijson = None
 
 
 ROOT = pathlib.Path(__file__).resolve().parent
@@ -18,47 +33,103 @@ DATA_DIR = ROOT / "src" / "data"
 RAW_PATH = DATA_DIR / "cards_raw.json"
 META_PATH = DATA_DIR / "card_metadata.json"
 
+# Digest of (cards_raw.json, card_metadata.json) as of the last run
+DIGEST_PATH = DATA_DIR / ".cards_raw.sha"
+
+_MISSING = object()
 
+
+# Both paths work on raw bytes (one read / one write, no text-mode codec)
 def load_json(path):
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def save_json(path, data):
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        # OPT_INDENT_2 writes the same bytes as json.dumps(..., indent=2)
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    path.write_bytes(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def load_elixir_lookup(path):
+    """name -> elixirCost from cards_raw.json (streamed when ijson is available)."""
+    if ijson is not None:
+        with path.open("rb") as f:
+            return {
+                c["name"]: c.get("elixirCost")
+                for c in ijson.items(f, "item", use_float=True)
+            }
+    return {c["name"]: c.get("elixirCost") for c in load_json(path)}
+
+
+def inputs_digest():
+    """
+    blake2b over both input files. Covering card_metadata.json too means a
+    hand edit to the skeleton (e.g. a new card) still triggers a run.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for path in (RAW_PATH, META_PATH):
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def read_digest():
+    try:
+        return DIGEST_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def write_digest(digest):
+    """Atomic write (temp file + os.replace) so a crash never leaves half a digest."""
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=".tmp-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(digest)
+    os.replace(tmp_path, DIGEST_PATH)
 
 
 def main():
-    raw_cards = load_json(RAW_PATH)
-    meta_cards = load_json(META_PATH)
+    if inputs_digest() == read_digest():
+        print("cards_raw.json and card_metadata.json unchanged since last run; nothing to do.")
+        return
 
-    # Build lookup: name → elixirCost
-    elixir_lookup = {}
-    for c in raw_cards:
-        name = c["name"]
-        cost = c.get("elixirCost")
-        elixir_lookup[name] = cost
+    elixir_lookup = load_elixir_lookup(RAW_PATH)
+    meta_cards = load_json(META_PATH)
 
     updated = 0
-    missing = []
+    changed = 0
 
+    # One lookup per card (a cost can legitimately be None, hence the sentinel)
+    lookup = elixir_lookup.get
     for c in meta_cards:
-        name = c["name"]
-        if name in elixir_lookup:
-            c["elixir"] = elixir_lookup[name]
-            updated += 1
-        else:
-            missing.append(name)
-
-    save_json(META_PATH, meta_cards)
-
-    print(f"Updated elixir for {updated} cards.")
+        cost = lookup(c["name"], _MISSING)
+        if cost is _MISSING:
+            continue
+        if c.get("elixir", _MISSING) != cost:
+            c["elixir"] = cost
+            changed += 1
+        updated += 1
+
+    missing = [c["name"] for c in meta_cards if c["name"] not in elixir_lookup]
+
+    # Skip the rewrite when every value was already current
+    if changed:
+        save_json(META_PATH, meta_cards)
+        print(f"Updated elixir for {updated} cards ({changed} changed).")
+    else:
+        print(f"Updated elixir for {updated} cards (no changes; skipped write).")
     if missing:
         print("These cards were not found in cards_raw.json:")
         for m in missing:
             print("   -", m)
 
+    # Digest of the files as written, so the next run can skip straight away
+    write_digest(inputs_digest())
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file